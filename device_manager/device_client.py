@@ -19,16 +19,24 @@ The client handles:
 """
 
 import asyncio
+import base64
 import json
 import logging
 import os
 import struct
 import uuid
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 logger = logging.getLogger(__name__)
 
+try:
+    # SIMD base64 straight to str in one allocation
+    from pybase64 import b64encode_as_string
+except ImportError:
+    def b64encode_as_string(data: Any) -> str:
+        return base64.b64encode(data).decode("ascii")
+
 
 DEFAULT_SOCKET_PATH = "/run/hailo/device.sock"
 DEFAULT_MAX_MESSAGE_BYTES = 8 * 1024 * 1024
@@ -57,15 +65,39 @@ async def _read_message(
 
 
 async def _write_message(
-    writer: asyncio.StreamWriter, payload: Dict[str, Any], max_bytes: int
+    writer: asyncio.StreamWriter,
+    payload: Dict[str, Any],
+    max_bytes: int,
+    attachments: Optional[List[memoryview]] = None,
 ) -> None:
+    if attachments:
+        payload["attachments"] = [len(buf) for buf in attachments]
     body = json.dumps(payload).encode("utf-8")
-    if len(body) > max_bytes:
-        raise RuntimeError(f"Request too large: {len(body)} bytes")
+    total = len(body) + sum(len(buf) for buf in attachments or ())
+    if total > max_bytes:
+        raise RuntimeError(f"Request too large: {total} bytes")
     writer.write(struct.pack(">I", len(body)) + body)
+    for buf in attachments or ():
+        writer.write(buf)
     await writer.drain()
 
 
+def _tensor_bytes(array: Any) -> memoryview:
+    """Flat byte view of a numpy array, copying only if it is not C-contiguous."""
+    if not array.flags.c_contiguous:
+        return memoryview(array.tobytes())
+    return memoryview(array).cast("B")
+
+
+def encode_tensor(array: Any) -> Dict[str, Any]:
+    """Encode numpy array as a base64 tensor object (JSON-only transport)."""
+    return {
+        "dtype": str(array.dtype),
+        "shape": list(array.shape),
+        "data_b64": b64encode_as_string(_tensor_bytes(array)),
+    }
+
+
 class HailoDeviceClient:
     """Client for communicating with hailo-device-manager."""
     
@@ -91,6 +123,7 @@ class HailoDeviceClient:
         self.reader: Optional[asyncio.StreamReader] = None
         self.writer: Optional[asyncio.StreamWriter] = None
         self._lock = asyncio.Lock()
+        self._binary_tensors: Optional[bool] = None
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -135,8 +168,12 @@ class HailoDeviceClient:
                 self.writer = None
                 self.reader = None
     
-    async def _send_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Send request and get response."""
+    async def _send_request(
+        self,
+        request: Dict[str, Any],
+        attachments: Optional[List[memoryview]] = None,
+    ) -> Dict[str, Any]:
+        """Send request (plus any raw attachment buffers) and get response."""
         async with self._lock:
             if not self.writer:
                 await self.connect()
@@ -145,7 +182,9 @@ class HailoDeviceClient:
             request["request_id"] = request_id
 
             try:
-                await _write_message(self.writer, request, self.max_message_bytes)
+                await _write_message(
+                    self.writer, request, self.max_message_bytes, attachments
+                )
                 response = await asyncio.wait_for(
                     _read_message(self.reader, self.max_message_bytes),
                     timeout=self.timeout,
@@ -235,6 +274,70 @@ class HailoDeviceClient:
         
         return await self._send_request(request)
     
+    async def supports_binary_tensors(self) -> bool:
+        """Whether the device manager accepts raw tensor attachments."""
+        if self._binary_tensors is None:
+            pong = await self.ping()
+            self._binary_tensors = "binary_tensors" in pong.get("features", ())
+        return self._binary_tensors
+
+    async def infer_binary(
+        self,
+        model_path: str,
+        input_data: Dict[str, Any],
+        tensors: Dict[str, List[Any]],
+        model_type: str = "vlm",
+        model_params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run inference, sending numpy tensors as raw bytes instead of base64.
+        
+        Each ``tensors`` entry is added to ``input_data`` under its key as a
+        list of tensor objects. The raw array bytes follow the JSON frame on
+        the socket, so nothing is base64 encoded or decoded. Falls back to
+        base64 tensor objects if the device manager predates the extension.
+        
+        Args:
+            model_path: Path to .hef model file
+            input_data: JSON-serializable input fields (prompt, options, ...)
+            tensors: Input field name -> list of numpy arrays
+            model_type: Type of model (vlm, vlm_chat, clip)
+            model_params: Optional parameters for model loading
+            
+        Returns:
+            Response dict with 'result' and 'inference_time_ms'
+        """
+        input_data = dict(input_data)
+        if not await self.supports_binary_tensors():
+            for key, arrays in tensors.items():
+                input_data[key] = [encode_tensor(array) for array in arrays]
+            return await self.infer(model_path, input_data, model_type, model_params)
+
+        attachments: List[memoryview] = []
+        for key, arrays in tensors.items():
+            refs = []
+            for array in arrays:
+                refs.append(
+                    {
+                        "dtype": str(array.dtype),
+                        "shape": list(array.shape),
+                        "attachment": len(attachments),
+                    }
+                )
+                attachments.append(_tensor_bytes(array))
+            input_data[key] = refs
+
+        request = {
+            "action": "infer",
+            "model_path": str(model_path),
+            "model_type": model_type,
+            "input_data": input_data,
+        }
+        if model_params:
+            request["model_params"] = model_params
+
+        return await self._send_request(request, attachments)
+    
     async def unload_model(
         self, model_path: str, model_type: str = "vlm"
     ) -> Dict[str, Any]:
@@ -75,6 +75,8 @@ DEFAULT_SOCKET_MODE = 0o660
 DEFAULT_MAX_MESSAGE_BYTES = 64 * 1024 * 1024
 # Maximum LRU evictions attempted before giving up on a load_model request.
 DEFAULT_MAX_EVICTIONS = 3
+# Advertised in ping/status so clients can negotiate optional protocol extensions.
+PROTOCOL_FEATURES = ("binary_tensors",)
 
 
 def _get_env_int(name: str, default: int) -> int:
@@ -131,7 +133,43 @@ async def read_message(
     payload = await _read_exact(reader, length)
     if payload is None:
         return None
-    return json.loads(payload.decode("utf-8"))
+    message = json.loads(payload.decode("utf-8"))
+
+    # Raw tensor bytes follow the JSON frame back to back, sized by the
+    # "attachments" list in the header (see _resolve_attachments)
+    attachment_sizes = message.pop("attachments", None)
+    if attachment_sizes:
+        if not isinstance(attachment_sizes, list) or not all(
+            type(size) is int and size >= 0 for size in attachment_sizes
+        ):
+            raise ValueError("Invalid attachment sizes")
+        total = length + sum(attachment_sizes)
+        if total > max_bytes:
+            raise ValueError(f"Message too large: {total} bytes")
+        buffers = []
+        for size in attachment_sizes:
+            data = await _read_exact(reader, size)
+            if data is None:
+                return None
+            buffers.append(data)
+        _resolve_attachments(message, buffers)
+    return message
+
+
+def _resolve_attachments(obj: Any, buffers: list) -> None:
+    """Replace {"attachment": index} tensor references with the raw bytes."""
+    if isinstance(obj, dict):
+        index = obj.get("attachment")
+        if isinstance(index, int) and "dtype" in obj:
+            if not 0 <= index < len(buffers):
+                raise ValueError(f"Invalid attachment index: {index}")
+            obj["data"] = buffers[index]
+            return
+        for value in obj.values():
+            _resolve_attachments(value, buffers)
+    elif isinstance(obj, list):
+        for value in obj:
+            _resolve_attachments(value, buffers)
 
 
 async def write_message(
@@ -702,11 +740,13 @@ def decode_tensor(payload: Dict[str, Any]) -> np.ndarray:
     dtype = payload.get("dtype")
     shape = payload.get("shape")
     data_b64 = payload.get("data_b64")
+    raw = payload.get("data")
 
-    if not dtype or shape is None or not data_b64:
+    if not dtype or shape is None or (raw is None and not data_b64):
         raise ValueError("tensor must include dtype, shape, and data_b64")
 
-    raw = base64.b64decode(data_b64)
+    if raw is None:
+        raw = base64.b64decode(data_b64)
     array = np.frombuffer(raw, dtype=np.dtype(dtype))
     return array.reshape(shape).copy()  # Copy to make writeable
 
@@ -994,6 +1034,7 @@ class HailoDeviceManager:
 
         return {
             "status": "ok",
+            "features": list(PROTOCOL_FEATURES),
             "device_id": self.device.device_id if self.device else None,
             "loaded_models": models,
             "uptime_seconds": time.time() - self.start_time,
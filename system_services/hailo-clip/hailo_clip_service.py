@@ -16,6 +16,7 @@ import sys
 import threading
 import time
 import traceback
+from collections import OrderedDict
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -23,7 +24,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import cv2
 import numpy as np
 import yaml
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from PIL import Image
 
 # Hailo Imports
@@ -84,6 +85,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger("hailo-clip-service")
 
+# Accept header value that selects the compact float16 embedding response
+BINARY_EMBEDDING_MIMETYPE = "application/octet-stream"
+
 
 class CLIPServiceConfig:
     """Load and validate CLIP service configuration."""
@@ -137,11 +141,15 @@ class CLIPServiceConfig:
     def performance(self) -> Dict[str, Any]:
         return self.config.get("performance", {})
 
+    @property
+    def text_embedding(self) -> Dict[str, Any]:
+        return self.config.get("text_embedding", {})
+
 
 class CLIPModel:
     """Wrapper for Hailo-accelerated CLIP model."""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], text_embedding: Optional[Dict[str, Any]] = None):
         self.config = config
         self.image_configured_model = None
         self.is_loaded = False
@@ -165,6 +173,13 @@ class CLIPModel:
         self.device_timeout_ms = int(config.get("device_timeout_ms", 5000))
         self.logit_scale = config.get("logit_scale", 100.0)
         self.apply_softmax = config.get("apply_softmax", True)
+
+        # Text embeddings are deterministic, so prompts reused across
+        # classify calls skip the tokenizer and the NPU round trip
+        text_embedding = text_embedding or {}
+        self.text_cache_enabled = bool(text_embedding.get("cache_enabled", True))
+        self.text_cache_max_entries = int(text_embedding.get("cache_max_entries", 1000))
+        self._text_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
         
         logger.info(f"CLIPModel initialized: {self.model_name}")
     
@@ -320,6 +335,11 @@ class CLIPModel:
     async def _encode_text_with_client(
         self, client: "HailoDeviceClient", text: str
     ) -> np.ndarray:
+        cached = self._text_cache.get(text)
+        if cached is not None:
+            self._text_cache.move_to_end(text)
+            return cached
+
         prepared = clip_text_utils.prepare_text_for_hailo_encoder(
             text=text,
             tokenizer=self.tokenizer,
@@ -350,7 +370,14 @@ class CLIPModel:
             last_token_positions=last_token_positions,
             text_projection=self.text_projection,
         )
-        return embedding.flatten().astype(np.float32)
+        embedding = embedding.flatten().astype(np.float32)
+        if self.text_cache_enabled and self.text_cache_max_entries > 0:
+            # Shared between requests, so keep callers from mutating it
+            embedding.flags.writeable = False
+            self._text_cache[text] = embedding
+            if len(self._text_cache) > self.text_cache_max_entries:
+                self._text_cache.popitem(last=False)
+        return embedding
 
     def encode_image_and_texts(
         self, image: Image.Image, prompts: List[str]
@@ -462,7 +489,7 @@ def create_app(config: CLIPServiceConfig) -> Flask:
     app = Flask(__name__)
     
     # Initialize CLIP model
-    clip_model = CLIPModel(config.clip)
+    clip_model = CLIPModel(config.clip, config.text_embedding)
     if not clip_model.load():
         logger.error("Failed to initialize CLIP model")
         sys.exit(1)
@@ -598,11 +625,7 @@ def create_app(config: CLIPServiceConfig) -> Flask:
             if embedding is None:
                 return jsonify({"error": "Failed to encode image"}), 500
             
-            return jsonify({
-                "embedding": embedding.tolist(),
-                "dimension": len(embedding),
-                "model": clip_model.model_name,
-            }), 200
+            return _embedding_response(embedding, clip_model.model_name)
             
         except Exception as e:
             logger.error(f"Embed image error: {e}")
@@ -627,11 +650,7 @@ def create_app(config: CLIPServiceConfig) -> Flask:
             if embedding is None:
                 return jsonify({"error": "Failed to encode text"}), 500
             
-            return jsonify({
-                "embedding": embedding.tolist(),
-                "dimension": len(embedding),
-                "model": clip_model.model_name,
-            }), 200
+            return _embedding_response(embedding, clip_model.model_name)
             
         except Exception as e:
             logger.error(f"Embed text error: {e}")
@@ -648,6 +667,28 @@ def create_app(config: CLIPServiceConfig) -> Flask:
     return app
 
 
+def _embedding_response(embedding: np.ndarray, model_name: str) -> Tuple[Any, int]:
+    """JSON by default; raw little-endian float16 when the client accepts it.
+
+    The binary form is 2 bytes per value instead of ~20 characters of JSON
+    number, with the dimension and model in X-Embedding-* headers.
+    """
+    best = request.accept_mimetypes.best_match(["application/json", BINARY_EMBEDDING_MIMETYPE])
+    if best == BINARY_EMBEDDING_MIMETYPE:
+        response = Response(
+            embedding.astype("<f2").tobytes(), mimetype=BINARY_EMBEDDING_MIMETYPE
+        )
+        response.headers["X-Embedding-Dtype"] = "float16"
+        response.headers["X-Embedding-Dimension"] = str(len(embedding))
+        response.headers["X-Embedding-Model"] = model_name
+        return response, 200
+    return jsonify({
+        "embedding": embedding.tolist(),
+        "dimension": len(embedding),
+        "model": model_name,
+    }), 200
+
+
 def _decode_image(data: Dict[str, Any]) -> Optional[Image.Image]:
     """
     Decode image from base64 or URL.
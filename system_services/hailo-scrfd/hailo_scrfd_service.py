@@ -17,14 +17,20 @@ import threading
 import traceback
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 
 import cv2
 import numpy as np
+import orjson
 import yaml
-from flask import Flask, jsonify, request
+from flask import Flask, Response, request
 from PIL import Image
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -32,6 +38,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger("hailo-scrfd-service")
 
+# multipart/form-data and query-string fields that are coerced from strings
+_FORM_BOOL_FIELDS = ("return_landmarks", "annotate", "draw_scores")
+_FORM_FLOAT_FIELDS = ("conf_threshold",)
+
+_LANDMARK_COLORS = [
+    (255, 0, 0),    # left eye - red
+    (0, 0, 255),    # right eye - blue
+    (0, 255, 255),  # nose - yellow
+    (255, 0, 255),  # left mouth - magenta
+    (255, 255, 0),  # right mouth - cyan
+]
+
 
 class SCRFDServiceConfig:
     """Load and validate SCRFD service configuration."""
@@ -45,7 +63,7 @@ class SCRFDServiceConfig:
         """Load configuration from YAML."""
         try:
             with open(self.yaml_path, "r", encoding="utf-8") as f:
-                self.config = yaml.safe_load(f) or {}
+                self.config = yaml.load(f, Loader=_YamlLoader) or {}
             
             logger.info(f"Loaded config from {self.yaml_path}")
         except FileNotFoundError:
@@ -101,6 +119,7 @@ class SCRFDModel:
         self.input_size = config.get("input_size", 640)
         self.conf_threshold = config.get("conf_threshold", 0.5)
         self.nms_threshold = config.get("nms_threshold", 0.4)
+        self._resized_buf: Optional[np.ndarray] = None
         
         logger.info(f"SCRFDModel initialized: {self.model_name} on device {self.device}")
     
@@ -110,6 +129,12 @@ class SCRFDModel:
             if self.is_loaded:
                 return True
             
+            # Reused by detect_faces() under self.lock to avoid a fresh
+            # input_size x input_size x 3 allocation per request
+            self._resized_buf = np.empty(
+                (self.input_size, self.input_size, 3), dtype=np.uint8
+            )
+            
             try:
                 # Import SCRFD pipeline from hailo-apps
                 # This assumes hailo-apps is in the Python path
@@ -169,7 +194,12 @@ class SCRFDModel:
         try:
             with self.lock:
                 # Preprocess image
-                img_resized = cv2.resize(image, (self.input_size, self.input_size))
+                img_resized = cv2.resize(
+                    image,
+                    (self.input_size, self.input_size),
+                    dst=self._resized_buf,
+                    interpolation=cv2.INTER_LINEAR,
+                )
                 
                 if self.model.get("mock", False):
                     # Mock model: return synthetic detections
@@ -246,26 +276,30 @@ def create_app(config: SCRFDServiceConfig) -> Flask:
         sys.exit(1)
     
     @app.route("/health", methods=["GET"])
-    def health() -> Tuple[Dict[str, Any], int]:
+    def health() -> Response:
         """Health check endpoint."""
-        return jsonify({
+        return _json_response({
             "status": "healthy",
             "service": "hailo-scrfd",
             "model_loaded": scrfd_model.is_loaded,
             "model": scrfd_model.model_name,
-        }), 200
+        }, 200)
     
     @app.route("/v1/detect", methods=["POST"])
-    def detect() -> Tuple[Dict[str, Any], int]:
+    def detect() -> Response:
         """
         Detect faces in an image.
         
-        Request body (JSON):
+        Request body (JSON, multipart/form-data with an 'image' file
+        field and the options below as form fields, or an
+        application/octet-stream .npy RGB uint8 array with the options
+        in the query string):
         {
             "image": "data:image/jpeg;base64,...",
             "return_landmarks": true,
             "conf_threshold": 0.5,
-            "annotate": false
+            "annotate": false,
+            "draw_scores": true
         }
         
         Response:
@@ -290,26 +324,23 @@ def create_app(config: SCRFDServiceConfig) -> Flask:
         }
         """
         try:
-            data = request.get_json()
+            try:
+                data = _read_request_data()
+            except ValueError as e:
+                return _json_response({"error": str(e)}, 400)
             if not data:
-                return jsonify({"error": "No JSON body"}), 400
+                return _json_response({"error": "No JSON body"}, 400)
             
             # Decode image
-            image = _decode_image(data)
-            if image is None:
-                return jsonify({"error": "Failed to decode image"}), 400
+            img_array = _load_image_array(data)
+            if img_array is None:
+                return _json_response({"error": "Failed to decode image"}, 400)
             
             # Configuration options
             return_landmarks = data.get("return_landmarks", True)
             conf_threshold = data.get("conf_threshold", scrfd_model.conf_threshold)
             annotate = data.get("annotate", False)
-            
-            # Convert PIL to numpy
-            img_array = np.array(image)
-            if img_array.ndim == 2:
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_GRAY2RGB)
-            elif img_array.shape[2] == 4:
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)
+            draw_scores = data.get("draw_scores", True)
             
             # Run detection
             import time
@@ -328,12 +359,12 @@ def create_app(config: SCRFDServiceConfig) -> Flask:
             for det in detections:
                 face = {
                     "bbox": det["bbox"],
-                    "confidence": float(det["confidence"]),
+                    "confidence": det["confidence"],
                 }
                 
                 if return_landmarks and "landmarks" in det:
                     face["landmarks"] = [
-                        {"type": landmark_names[i], "x": int(pt[0]), "y": int(pt[1])}
+                        {"type": landmark_names[i], "x": pt[0], "y": pt[1]}
                         for i, pt in enumerate(det["landmarks"])
                     ]
                 
@@ -348,39 +379,41 @@ def create_app(config: SCRFDServiceConfig) -> Flask:
             
             # Optional annotation
             if annotate:
-                annotated = _annotate_image(img_array, detections)
-                _, buffer = cv2.imencode('.jpg', cv2.cvtColor(annotated, cv2.COLOR_RGB2BGR))
-                annotated_b64 = base64.b64encode(buffer).decode('utf-8')
-                response["annotated_image"] = f"data:image/jpeg;base64,{annotated_b64}"
+                annotated = _annotate_image(
+                    img_array,
+                    detections,
+                    draw_landmarks=return_landmarks,
+                    draw_scores=draw_scores,
+                )
+                response["annotated_image"] = _encode_jpeg_data_uri(annotated)
             
-            return jsonify(response), 200
+            return _json_response(response, 200)
             
         except Exception as e:
             logger.error(f"Detect error: {e}")
             traceback.print_exc()
-            return jsonify({"error": str(e)}), 500
+            return _json_response({"error": str(e)}, 500)
     
     @app.route("/v1/align", methods=["POST"])
-    def align() -> Tuple[Dict[str, Any], int]:
+    def align() -> Response:
         """
         Detect faces and return aligned face crops.
         
+        Accepts the same JSON, multipart/form-data or .npy body as /v1/detect.
+        
         Response includes aligned face images suitable for face recognition.
         """
         try:
-            data = request.get_json()
+            try:
+                data = _read_request_data()
+            except ValueError as e:
+                return _json_response({"error": str(e)}, 400)
             if not data:
-                return jsonify({"error": "No JSON body"}), 400
+                return _json_response({"error": "No JSON body"}, 400)
             
-            image = _decode_image(data)
-            if image is None:
-                return jsonify({"error": "Failed to decode image"}), 400
-            
-            img_array = np.array(image)
-            if img_array.ndim == 2:
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_GRAY2RGB)
-            elif img_array.shape[2] == 4:
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)
+            img_array = _load_image_array(data)
+            if img_array is None:
+                return _json_response({"error": "Failed to decode image"}, 400)
             
             detections = scrfd_model.detect_faces(img_array)
             
@@ -389,50 +422,166 @@ def create_app(config: SCRFDServiceConfig) -> Flask:
                 # Align face using landmarks
                 aligned = _align_face(img_array, det["landmarks"])
                 
-                # Encode to base64
-                _, buffer = cv2.imencode('.jpg', cv2.cvtColor(aligned, cv2.COLOR_RGB2BGR))
-                face_b64 = base64.b64encode(buffer).decode('utf-8')
-                
                 aligned_faces.append({
                     "face_id": i,
                     "bbox": det["bbox"],
-                    "confidence": float(det["confidence"]),
-                    "aligned_image": f"data:image/jpeg;base64,{face_b64}"
+                    "confidence": det["confidence"],
+                    "aligned_image": _encode_jpeg_data_uri(aligned),
                 })
             
-            return jsonify({
+            return _json_response({
                 "faces": aligned_faces,
                 "num_faces": len(aligned_faces),
                 "model": scrfd_model.model_name,
-            }), 200
+            }, 200)
             
         except Exception as e:
             logger.error(f"Align error: {e}")
-            return jsonify({"error": str(e)}), 500
+            return _json_response({"error": str(e)}, 500)
     
     @app.errorhandler(404)
-    def not_found(e) -> Tuple[Dict[str, Any], int]:
-        return jsonify({"error": "Endpoint not found"}), 404
+    def not_found(e) -> Response:
+        return _json_response({"error": "Endpoint not found"}, 404)
     
     @app.errorhandler(500)
-    def internal_error(e) -> Tuple[Dict[str, Any], int]:
-        return jsonify({"error": "Internal server error"}), 500
+    def internal_error(e) -> Response:
+        return _json_response({"error": "Internal server error"}, 500)
     
     return app
 
 
+def _json_response(payload: Dict[str, Any], status: int = 200) -> Response:
+    """
+    Serialize a response payload with orjson.
+    
+    numpy scalars and arrays are serialized natively, so detection values
+    do not need to be cast to Python types first.
+    """
+    return Response(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype="application/json",
+    )
+
+
+def _encode_jpeg_data_uri(image: np.ndarray) -> str:
+    """Encode an RGB image array as a JPEG data URI."""
+    _, buffer = cv2.imencode(".jpg", cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+    return f"data:image/jpeg;base64,{base64.b64encode(buffer).decode('ascii')}"
+
+
+def _read_request_data() -> Optional[Dict[str, Any]]:
+    """
+    Read request options from a JSON body, a multipart/form-data upload,
+    or a raw NumPy array body.
+    
+    Multipart uploads carry raw image bytes in the 'image' file field,
+    which skips the base64 encode/decode round-trip. An
+    application/octet-stream body is an .npy-serialized uint8 RGB array
+    (options in the query string), which skips image codecs entirely.
+    Form and query fields are coerced to the same types the JSON API
+    accepts.
+    
+    Returns:
+        Request data dict, or None if the body is empty
+    """
+    if request.mimetype == "multipart/form-data":
+        data = _coerce_fields(request.form.items())
+        upload = request.files.get("image")
+        if upload is not None:
+            data["image_bytes"] = upload.read()
+        return data
+    
+    if request.mimetype == "application/octet-stream":
+        body = request.get_data()
+        if not body:
+            return None
+        data = _coerce_fields(request.args.items())
+        data["image_npy"] = body
+        return data
+    
+    return request.get_json()
+
+
+def _coerce_fields(items) -> Dict[str, Any]:
+    """
+    Coerce string form/query fields to the JSON API's types.
+    
+    Raises:
+        ValueError: A numeric field does not parse, naming the field
+    """
+    data: Dict[str, Any] = {}
+    for key, value in items:
+        if key in _FORM_BOOL_FIELDS:
+            data[key] = value.strip().lower() in ("1", "true", "yes", "on")
+        elif key in _FORM_FLOAT_FIELDS:
+            try:
+                data[key] = float(value)
+            except ValueError:
+                raise ValueError(f"Invalid number for '{key}': {value!r}") from None
+        else:
+            data[key] = value
+    return data
+
+
+def _load_image_array(data: Dict[str, Any]) -> Optional[np.ndarray]:
+    """
+    Load the request image as an RGB uint8 array (H, W, 3).
+    
+    Raw .npy bodies are used directly; everything else goes through
+    _decode_image.
+    
+    Returns:
+        Image array or None on error
+    """
+    if "image_npy" in data:
+        try:
+            img_array = np.load(BytesIO(data["image_npy"]), allow_pickle=False)
+        except Exception as e:
+            logger.error(f"Failed to load .npy image: {e}")
+            return None
+        
+        # np.load also opens .npz archives, which are not arrays
+        if not isinstance(img_array, np.ndarray) or img_array.size == 0:
+            logger.error("Unsupported .npy image: not a non-empty array")
+            return None
+        if img_array.dtype != np.uint8 or img_array.ndim not in (2, 3):
+            logger.error(f"Unsupported .npy image: dtype={img_array.dtype} shape={img_array.shape}")
+            return None
+        if img_array.ndim == 3 and img_array.shape[2] not in (3, 4):
+            logger.error(f"Unsupported .npy image channels: shape={img_array.shape}")
+            return None
+    else:
+        image = _decode_image(data)
+        if image is None:
+            return None
+        img_array = np.array(image)
+    
+    if img_array.ndim == 2:
+        img_array = cv2.cvtColor(img_array, cv2.COLOR_GRAY2RGB)
+    elif img_array.shape[2] == 4:
+        img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)
+    
+    return img_array
+
+
 def _decode_image(data: Dict[str, Any]) -> Optional[Image.Image]:
     """
-    Decode image from base64 or URL.
+    Decode image from raw upload bytes, base64 or URL.
     
     Args:
-        data: Request data dict with 'image' (base64) or 'image_url'
+        data: Request data dict with 'image_bytes' (multipart upload),
+            'image' (base64) or 'image_url'
         
     Returns:
         PIL Image or None on error
     """
     try:
-        if "image" in data:
+        if "image_bytes" in data:
+            image = Image.open(BytesIO(data["image_bytes"]))
+            return image.convert("RGB")
+        
+        elif "image" in data:
             # Base64 encoded image
             b64_str = data["image"]
             if isinstance(b64_str, str) and b64_str.startswith("data:"):
@@ -457,13 +606,20 @@ def _decode_image(data: Dict[str, Any]) -> Optional[Image.Image]:
         return None
 
 
-def _annotate_image(image: np.ndarray, detections: List[Dict[str, Any]]) -> np.ndarray:
+def _annotate_image(
+    image: np.ndarray,
+    detections: List[Dict[str, Any]],
+    draw_landmarks: bool = True,
+    draw_scores: bool = True,
+) -> np.ndarray:
     """
     Draw bounding boxes and landmarks on image.
     
     Args:
         image: Image array (H, W, 3)
         detections: List of face detections with bbox and landmarks
+        draw_landmarks: Draw the 5 landmark points for each face
+        draw_scores: Draw the confidence score above each box
         
     Returns:
         Annotated image array
@@ -472,7 +628,6 @@ def _annotate_image(image: np.ndarray, detections: List[Dict[str, Any]]) -> np.n
     
     for det in detections:
         bbox = det["bbox"]
-        conf = det["confidence"]
         
         # Draw bounding box
         cv2.rectangle(annotated, 
@@ -481,26 +636,60 @@ def _annotate_image(image: np.ndarray, detections: List[Dict[str, Any]]) -> np.n
                      (0, 255, 0), 2)
         
         # Draw confidence
-        text = f"{conf:.2f}"
-        cv2.putText(annotated, text, (bbox[0], bbox[1] - 5),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+        if draw_scores:
+            text = f"{det['confidence']:.2f}"
+            cv2.putText(annotated, text, (bbox[0], bbox[1] - 5),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
         
         # Draw landmarks
-        if "landmarks" in det:
-            colors = [
-                (255, 0, 0),    # left eye - red
-                (0, 0, 255),    # right eye - blue
-                (0, 255, 255),  # nose - yellow
-                (255, 0, 255),  # left mouth - magenta
-                (255, 255, 0),  # right mouth - cyan
-            ]
+        if draw_landmarks and "landmarks" in det:
             for i, pt in enumerate(det["landmarks"]):
-                color = colors[i] if i < len(colors) else (255, 255, 255)
+                color = _LANDMARK_COLORS[i] if i < len(_LANDMARK_COLORS) else (255, 255, 255)
                 cv2.circle(annotated, (int(pt[0]), int(pt[1])), 3, color, -1)
     
     return annotated
 
 
+def _umeyama_similarity(src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """
+    Closed-form least-squares similarity transform (Umeyama, 1991).
+    
+    All 5 landmark correspondences are trusted, so this replaces the
+    RANSAC loop in cv2.estimateAffinePartial2D with a single 2x2 SVD.
+    
+    Args:
+        src: Source points (N, 2)
+        dst: Destination points (N, 2)
+        
+    Returns:
+        2x3 affine matrix mapping src onto dst
+    """
+    src = src.astype(np.float64)
+    dst = dst.astype(np.float64)
+    
+    src_mean = src.mean(axis=0)
+    dst_mean = dst.mean(axis=0)
+    src_centered = src - src_mean
+    dst_centered = dst - dst_mean
+    
+    cov = dst_centered.T @ src_centered / src.shape[0]
+    u, sigma, vt = np.linalg.svd(cov)
+    
+    # Guard against a reflection
+    d = np.ones(2)
+    if np.linalg.det(u) * np.linalg.det(vt) < 0:
+        d[1] = -1.0
+    
+    rotation = (u * d) @ vt
+    src_var = (src_centered ** 2).sum() / src.shape[0]
+    scale = (sigma * d).sum() / src_var
+    
+    tform = np.empty((2, 3), dtype=np.float64)
+    tform[:, :2] = scale * rotation
+    tform[:, 2] = dst_mean - scale * rotation @ src_mean
+    return tform
+
+
 def _align_face(image: np.ndarray, landmarks: List[List[int]], output_size: int = 112) -> np.ndarray:
     """
     Align face using 5-point landmarks.
@@ -532,7 +721,7 @@ def _align_face(image: np.ndarray, landmarks: List[List[int]], output_size: int
     src_landmarks = np.array(landmarks, dtype=np.float32)
     
     # Compute similarity transform
-    tform = cv2.estimateAffinePartial2D(src_landmarks, ref_landmarks)[0]
+    tform = _umeyama_similarity(src_landmarks, ref_landmarks)
     
     # Warp image
     aligned = cv2.warpAffine(image, tform, (output_size, output_size))
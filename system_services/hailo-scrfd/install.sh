@@ -61,13 +61,19 @@ import numpy
 import PIL
 import cv2
 import flask
+import orjson
 PY
     then
         error "Missing required Python packages. Install with:"
         error "  sudo apt install python3-yaml python3-numpy python3-pil python3-flask"
-        error "  pip3 install opencv-python"
+        error "  pip3 install opencv-python orjson"
         exit 1
     fi
+
+    if ! python3 -c "from yaml import CSafeLoader" >/dev/null 2>&1; then
+        warn "PyYAML built without libyaml; config parsing will use the pure-Python loader"
+        warn "  sudo apt install libyaml-0-2 python3-yaml"
+    fi
 }
 
 preflight_hailo() {
@@ -14,6 +14,11 @@ from typing import Any, Dict
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 def render_config(yaml_path: Path, json_path: Path) -> None:
     """
@@ -25,7 +30,7 @@ def render_config(yaml_path: Path, json_path: Path) -> None:
     """
     try:
         with open(yaml_path, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f) or {}
+            config = yaml.load(f, Loader=_YamlLoader) or {}
         
         # Transform to hailo-apps JSON format if needed
         json_config: Dict[str, Any] = {
@@ -1,5 +1,52 @@
+import base64
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
 import pytest
 
+# Frozen fixture images, generated once so tests are byte-for-byte
+# deterministic across platforms and JPEG encoder versions
+DATA_DIR = Path(__file__).parent / "data"
+
+# Set HAILO_SCRFD_RANDOM_IMAGE=1 to use fresh random noise for sample_image_b64
+RANDOM_SAMPLE_IMAGE = os.environ.get("HAILO_SCRFD_RANDOM_IMAGE", "").lower() in ("1", "true", "yes")
+
+# Upper bound for `pytest -n auto` (pytest-xdist); the service handles 5
+# concurrent requests (see test_concurrent_requests). Set to 1 for a
+# single-worker endpoint.
+MAX_TEST_WORKERS = int(os.environ.get("HAILO_SCRFD_TEST_WORKERS", "4"))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """Cap `-n auto` at the service's concurrency instead of the CPU count."""
+    return max(1, min(os.cpu_count() or 1, MAX_TEST_WORKERS))
+
+
+def _read_b64(name: str) -> str:
+    return base64.b64encode(DATA_DIR.joinpath(name).read_bytes()).decode('ascii')
+
+
+def _encode_jpeg_b64(img_array: np.ndarray) -> str:
+    """Encode an RGB image array as base64 JPEG via libjpeg (cv2)."""
+    ok, buf = cv2.imencode(
+        ".jpg",
+        cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR),
+        [cv2.IMWRITE_JPEG_QUALITY, 85],
+    )
+    assert ok, "cv2.imencode failed"
+    return base64.b64encode(buf).decode('utf-8')
+
+
+def _sample_image_b64() -> str:
+    if not RANDOM_SAMPLE_IMAGE:
+        return _read_b64("sample.jpg")
+
+    img_array = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    return _encode_jpeg_b64(img_array)
+
 
 @pytest.fixture(scope="session")
 def service_url():
@@ -7,46 +54,13 @@ def service_url():
     return "http://localhost:5001"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_image_b64():
     """Sample base64-encoded test image."""
-    import base64
-    from io import BytesIO
-    from PIL import Image
-    import numpy as np
-    
-    # Create a simple test image
-    img_array = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
-    img = Image.fromarray(img_array)
-    
-    buffer = BytesIO()
-    img.save(buffer, format="JPEG")
-    img_bytes = buffer.getvalue()
-    
-    return base64.b64encode(img_bytes).decode('utf-8')
+    return _sample_image_b64()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def face_image_b64():
-    """Sample face-like image for testing."""
-    import base64
-    from io import BytesIO
-    from PIL import Image
-    import numpy as np
-    import cv2
-    
-    # Create image with face-like pattern
-    img_array = np.ones((480, 640, 3), dtype=np.uint8) * 200
-    
-    # Draw simple face
-    cv2.circle(img_array, (320, 240), 60, (255, 200, 150), -1)
-    cv2.circle(img_array, (300, 225), 5, (0, 0, 0), -1)
-    cv2.circle(img_array, (340, 225), 5, (0, 0, 0), -1)
-    cv2.ellipse(img_array, (320, 260), (20, 10), 0, 0, 180, (0, 0, 0), 2)
-    
-    img = Image.fromarray(img_array)
-    buffer = BytesIO()
-    img.save(buffer, format="JPEG")
-    img_bytes = buffer.getvalue()
-    
-    return base64.b64encode(img_bytes).decode('utf-8')
+    """Sample face-like image for testing (tests/data/face.jpg)."""
+    return _read_b64("face.jpg")
@@ -1,5 +1,6 @@
+import asyncio
 import base64
-import json
+import functools
 import os
 import time
 from io import BytesIO
@@ -8,19 +9,78 @@ from typing import Any, Dict
 
 import cv2
 import numpy as np
+import orjson
 import pytest
 import requests
-from PIL import Image
+from requests.adapters import HTTPAdapter
 
 
 # Configuration
 BASE_URL = os.environ.get("HAILO_SCRFD_URL", "http://localhost:5001")
+DETECT_URL = f"{BASE_URL}/v1/detect"
+ALIGN_URL = f"{BASE_URL}/v1/align"
+HEALTH_URL = f"{BASE_URL}/health"
+JPEG_PREFIX = "data:image/jpeg;base64,"
 TIMEOUT = 30
+JSON_HEADERS = {"Content-Type": "application/json"}
+NPY_HEADERS = {"Content-Type": "application/octet-stream"}
 
+# Upload raw .npy arrays instead of JPEGs in tests that only check the API
+# contract (codec-specific tests always use JPEG/PNG)
+USE_RAW_NPY = bool(os.environ.get("HAILO_USE_RAW_NPY"))
 
-def create_test_image(width: int = 640, height: int = 480, format: str = "JPEG") -> str:
+# Shared keep-alive session for synchronous tests
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
+
+def _encode_image(img_array: np.ndarray, format: str = "JPEG") -> np.ndarray:
     """
-    Create a test image with a simple pattern and encode to base64.
+    Encode a BGR image array (JPEG or PNG) via cv2/libjpeg.
+    
+    Images are built in BGR order so the array is handed to the encoder
+    as-is, with no channel-swap copy.
+    """
+    ext = ".png" if format.upper() == "PNG" else ".jpg"
+    ok, buf = cv2.imencode(ext, img_array)
+    assert ok, f"cv2.imencode failed for {format}"
+    return buf
+
+
+def _b64_to_bgr(image_b64: str) -> np.ndarray:
+    """Decode a base64 image (data URI prefix optional) to a BGR array via cv2."""
+    raw = base64.b64decode(image_b64.split(",", 1)[-1])
+    return cv2.imdecode(np.frombuffer(raw, np.uint8), cv2.IMREAD_COLOR)
+
+
+@functools.lru_cache(maxsize=None)
+def image_body(image_b64: str, subtype: str = "jpeg") -> bytes:
+    """
+    Pre-serialized JSON request body for {"image": <data URI>}.
+    
+    Cached so the large base64 payload is JSON-encoded once per image
+    instead of on every request.
+    """
+    return orjson.dumps({"image": f"data:image/{subtype};base64,{image_b64}"})
+
+
+def _gradient_bgr(width: int, height: int) -> np.ndarray:
+    """Simple vertical gradient test image in BGR order."""
+    # Compute one (height, 1, 3) BGR column and replicate it across the
+    # width with a single copy
+    rows = np.arange(height, dtype=np.int32) * 255 // height
+    column = np.empty((height, 1, 3), dtype=np.uint8)
+    column[:, 0, 0] = 255 - rows  # B
+    column[:, 0, 1] = 128         # G
+    column[:, 0, 2] = rows        # R
+    return np.ascontiguousarray(np.broadcast_to(column, (height, width, 3)))
+
+
+def create_test_image_bytes(width: int = 640, height: int = 480, format: str = "JPEG") -> bytes:
+    """
+    Create a test image with a simple pattern as raw encoded bytes.
+    
+    Used for multipart/form-data uploads, which skip base64 entirely.
     
     Args:
         width: Image width
@@ -28,24 +88,66 @@ def create_test_image(width: int = 640, height: int = 480, format: str = "JPEG")
         format: Image format (JPEG, PNG)
         
     Returns:
-        Base64-encoded image string
+        Encoded image bytes
     """
-    # Create a simple gradient image
-    img_array = np.zeros((height, width, 3), dtype=np.uint8)
-    
-    # Add gradient
-    for i in range(height):
-        img_array[i, :, :] = [i * 255 // height, 128, 255 - i * 255 // height]
-    
-    # Convert to PIL Image
-    img = Image.fromarray(img_array)
+    return _encode_image(_gradient_bgr(width, height), format).tobytes()
+
+
+def create_test_npy_bytes(width: int = 640, height: int = 480) -> bytes:
+    """
+    Serialize the gradient test image as an .npy RGB uint8 array.
     
-    # Encode to base64
+    Used for the application/octet-stream upload path, which skips JPEG
+    encode on the client and decode on the server.
+    """
     buffer = BytesIO()
-    img.save(buffer, format=format)
-    img_bytes = buffer.getvalue()
+    np.save(buffer, np.ascontiguousarray(_gradient_bgr(width, height)[..., ::-1]))
+    return buffer.getvalue()
+
+
+def upload_kwargs(width: int = 640, height: int = 480) -> Dict[str, Any]:
+    """
+    requests kwargs that upload the gradient test image without base64.
+    
+    Sends a multipart JPEG by default, or a raw .npy array when
+    HAILO_USE_RAW_NPY is set.
+    """
+    if USE_RAW_NPY:
+        return {"data": create_test_npy_bytes(width, height), "headers": NPY_HEADERS}
+    return {"files": {"image": ("test.jpg", create_test_image_bytes(width, height), "image/jpeg")}}
+
+
+def create_test_image(width: int = 640, height: int = 480, format: str = "JPEG") -> str:
+    """
+    Create a test image with a simple pattern and encode to base64.
     
-    return base64.b64encode(img_bytes).decode('utf-8')
+    Args:
+        width: Image width
+        height: Image height
+        format: Image format (JPEG, PNG)
+        
+    Returns:
+        Base64-encoded image string
+    """
+    return base64.b64encode(create_test_image_bytes(width, height, format)).decode('utf-8')
+
+
+FACE_RADIUS = 60
+FACE_BACKGROUND = 200
+
+
+def _face_sprite() -> np.ndarray:
+    """Render one face pattern (BGR) on a background-colored square."""
+    r = FACE_RADIUS
+    sprite = np.full((2 * r + 1, 2 * r + 1, 3), FACE_BACKGROUND, dtype=np.uint8)
+    # Draw circle for face
+    cv2.circle(sprite, (r, r), r, (150, 200, 255), -1)
+    # Draw eyes
+    cv2.circle(sprite, (r - 20, r - 15), 5, (0, 0, 0), -1)
+    cv2.circle(sprite, (r + 20, r - 15), 5, (0, 0, 0), -1)
+    # Draw mouth
+    cv2.ellipse(sprite, (r, r + 20), (20, 10), 0, 0, 180, (0, 0, 0), 2)
+    return sprite
 
 
 def create_face_image(num_faces: int = 1) -> str:
@@ -59,32 +161,71 @@ def create_face_image(num_faces: int = 1) -> str:
         Base64-encoded image string
     """
     width, height = 640, 480
-    img_array = np.ones((height, width, 3), dtype=np.uint8) * 200  # Light gray background
+    img_array = np.full((height, width, 3), FACE_BACKGROUND, dtype=np.uint8)  # Light gray background
     
-    # Draw simple face-like patterns
+    # Stamp the pre-rendered face at each position (positions do not overlap)
     face_positions = [
         (width // 4, height // 2),
         (3 * width // 4, height // 2),
         (width // 2, height // 4),
     ]
+    sprite = _face_sprite()
+    r = FACE_RADIUS
     
-    for i in range(min(num_faces, len(face_positions))):
-        x, y = face_positions[i]
-        # Draw circle for face
-        cv2.circle(img_array, (x, y), 60, (255, 200, 150), -1)
-        # Draw eyes
-        cv2.circle(img_array, (x - 20, y - 15), 5, (0, 0, 0), -1)
-        cv2.circle(img_array, (x + 20, y - 15), 5, (0, 0, 0), -1)
-        # Draw mouth
-        cv2.ellipse(img_array, (x, y + 20), (20, 10), 0, 0, 180, (0, 0, 0), 2)
-    
-    # Convert to PIL and encode
-    img = Image.fromarray(img_array)
-    buffer = BytesIO()
-    img.save(buffer, format="JPEG")
-    img_bytes = buffer.getvalue()
+    for x, y in face_positions[:num_faces]:
+        img_array[y - r:y + r + 1, x - r:x + r + 1] = sprite
     
-    return base64.b64encode(img_bytes).decode('utf-8')
+    return base64.b64encode(_encode_image(img_array, "JPEG")).decode('utf-8')
+
+
+# Each distinct test image is built by a session fixture, so it is generated
+# and encoded once per test session
+@pytest.fixture(scope="session")
+def default_test_image() -> str:
+    """640x480 JPEG gradient."""
+    return create_test_image()
+
+
+@pytest.fixture(scope="session")
+def default_test_image_bytes() -> bytes:
+    """640x480 JPEG gradient as raw bytes for multipart uploads."""
+    return create_test_image_bytes()
+
+
+@pytest.fixture(scope="session")
+def default_upload() -> Dict[str, Any]:
+    """640x480 gradient upload kwargs (multipart JPEG or .npy)."""
+    return upload_kwargs()
+
+
+@pytest.fixture(scope="session")
+def small_upload() -> Dict[str, Any]:
+    """32x32 gradient upload kwargs."""
+    return upload_kwargs(width=32, height=32)
+
+
+@pytest.fixture(scope="session")
+def large_upload() -> Dict[str, Any]:
+    """1920x1080 gradient upload kwargs."""
+    return upload_kwargs(width=1920, height=1080)
+
+
+@pytest.fixture(scope="session")
+def png_test_image() -> str:
+    """640x480 PNG gradient."""
+    return create_test_image(format="PNG")
+
+
+@pytest.fixture(scope="session")
+def face_image_single() -> str:
+    """Synthetic image with one face pattern."""
+    return create_face_image(num_faces=1)
+
+
+@pytest.fixture(scope="session")
+def face_image_pair() -> str:
+    """Synthetic image with two face patterns."""
+    return create_face_image(num_faces=2)
 
 
 class TestHealthEndpoint:
@@ -92,10 +233,10 @@ class TestHealthEndpoint:
     
     def test_health_check_success(self):
         """Health endpoint should return 200 and service status."""
-        response = requests.get(f"{BASE_URL}/health", timeout=TIMEOUT)
+        response = SESSION.get(HEALTH_URL, timeout=TIMEOUT)
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         
         assert data["status"] == "healthy"
         assert data["service"] == "hailo-scrfd"
@@ -104,29 +245,74 @@ class TestHealthEndpoint:
     
     def test_health_check_fields(self):
         """Health endpoint should include all required fields."""
-        response = requests.get(f"{BASE_URL}/health", timeout=TIMEOUT)
-        data = response.json()
+        response = SESSION.get(HEALTH_URL, timeout=TIMEOUT)
+        data = orjson.loads(response.content)
         
         required_fields = ["status", "service", "model_loaded", "model"]
         for field in required_fields:
             assert field in data, f"Missing field: {field}"
 
 
+def _check_landmarks(data: Dict[str, Any], options: Dict[str, Any]) -> None:
+    """return_landmarks=true should include 5 typed integer landmarks."""
+    # Check if any faces detected (mock model should return at least 1)
+    if data["num_faces"] > 0:
+        face = data["faces"][0]
+        assert "landmarks" in face
+        assert len(face["landmarks"]) == 5
+        
+        # Check landmark structure
+        landmark_types = [lm["type"] for lm in face["landmarks"]]
+        expected_types = ["left_eye", "right_eye", "nose", "left_mouth", "right_mouth"]
+        assert landmark_types == expected_types
+        
+        # Check landmark coordinates
+        for lm in face["landmarks"]:
+            assert "x" in lm
+            assert "y" in lm
+            assert isinstance(lm["x"], int)
+            assert isinstance(lm["y"], int)
+
+
+def _check_no_landmarks(data: Dict[str, Any], options: Dict[str, Any]) -> None:
+    """return_landmarks=false should omit landmarks."""
+    if data["num_faces"] > 0:
+        face = data["faces"][0]
+        assert "landmarks" not in face
+
+
+def _check_threshold(data: Dict[str, Any], options: Dict[str, Any]) -> None:
+    """All faces should meet the requested confidence threshold."""
+    for face in data["faces"]:
+        assert face["confidence"] >= options["conf_threshold"]
+
+
+def _check_annotation(data: Dict[str, Any], options: Dict[str, Any]) -> None:
+    """annotate=true should return an annotated image."""
+    if data["num_faces"] > 0:
+        assert "annotated_image" in data
+        assert data["annotated_image"].startswith(JPEG_PREFIX)
+        
+        # Annotated image keeps the input dimensions
+        annotated = _b64_to_bgr(data["annotated_image"])
+        assert annotated is not None
+        assert annotated.shape == (480, 640, 3)
+
+
 class TestDetectEndpoint:
     """Tests for the /v1/detect endpoint."""
     
-    def test_detect_with_base64_image(self):
+    def test_detect_with_base64_image(self, default_test_image):
         """Detect faces in a base64-encoded image."""
-        image_b64 = create_test_image()
-        
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={"image": f"data:image/jpeg;base64,{image_b64}"},
+        response = SESSION.post(
+            DETECT_URL,
+            data=image_body(default_test_image),
+            headers=JSON_HEADERS,
             timeout=TIMEOUT
         )
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         
         assert "faces" in data
         assert "num_faces" in data
@@ -136,165 +322,134 @@ class TestDetectEndpoint:
         assert isinstance(data["num_faces"], int)
         assert data["num_faces"] == len(data["faces"])
     
-    def test_detect_without_data_uri_prefix(self):
+    def test_detect_without_data_uri_prefix(self, default_test_image):
         """Detect should work with plain base64 (no data URI prefix)."""
-        image_b64 = create_test_image()
-        
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={"image": image_b64},
+        response = SESSION.post(
+            DETECT_URL,
+            data=orjson.dumps({"image": default_test_image}),
+            headers=JSON_HEADERS,
             timeout=TIMEOUT
         )
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "faces" in data
     
-    def test_detect_with_landmarks(self):
-        """Detect faces with return_landmarks=true should include landmarks."""
-        image_b64 = create_face_image(num_faces=1)
-        
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={
-                "image": f"data:image/jpeg;base64,{image_b64}",
-                "return_landmarks": True
-            },
+    def test_detect_multipart_upload(self, default_test_image_bytes):
+        """Detect should accept a raw multipart upload with form options."""
+        response = SESSION.post(
+            DETECT_URL,
+            files={"image": ("test.jpg", default_test_image_bytes, "image/jpeg")},
+            data={"return_landmarks": "false", "conf_threshold": "0.3"},
             timeout=TIMEOUT
         )
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         
-        # Check if any faces detected (mock model should return at least 1)
-        if data["num_faces"] > 0:
-            face = data["faces"][0]
-            assert "landmarks" in face
-            assert len(face["landmarks"]) == 5
-            
-            # Check landmark structure
-            landmark_types = [lm["type"] for lm in face["landmarks"]]
-            expected_types = ["left_eye", "right_eye", "nose", "left_mouth", "right_mouth"]
-            assert landmark_types == expected_types
-            
-            # Check landmark coordinates
-            for lm in face["landmarks"]:
-                assert "x" in lm
-                assert "y" in lm
-                assert isinstance(lm["x"], int)
-                assert isinstance(lm["y"], int)
-    
-    def test_detect_without_landmarks(self):
-        """Detect with return_landmarks=false should omit landmarks."""
-        image_b64 = create_face_image()
-        
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={
-                "image": f"data:image/jpeg;base64,{image_b64}",
-                "return_landmarks": False
-            },
-            timeout=TIMEOUT
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        
-        if data["num_faces"] > 0:
-            face = data["faces"][0]
+        assert data["num_faces"] == len(data["faces"])
+        for face in data["faces"]:
             assert "landmarks" not in face
+            assert face["confidence"] >= 0.3
     
-    def test_detect_with_custom_threshold(self):
-        """Detect with custom confidence threshold."""
-        image_b64 = create_face_image()
-        
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={
-                "image": f"data:image/jpeg;base64,{image_b64}",
-                "conf_threshold": 0.3
-            },
+    def test_detect_raw_npy_upload(self):
+        """Detect should accept a raw .npy array body with query-string options."""
+        response = SESSION.post(
+            DETECT_URL,
+            params={"return_landmarks": "false"},
+            data=create_test_npy_bytes(),
+            headers=NPY_HEADERS,
             timeout=TIMEOUT
         )
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         
-        # All faces should meet threshold
+        assert data["num_faces"] == len(data["faces"])
         for face in data["faces"]:
-            assert face["confidence"] >= 0.3
+            assert "landmarks" not in face
     
-    def test_detect_with_annotation(self):
-        """Detect with annotate=true should return annotated image."""
-        image_b64 = create_face_image()
-        
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={
-                "image": f"data:image/jpeg;base64,{image_b64}",
-                "annotate": True
-            },
+    def test_detect_rejects_pickled_npy(self):
+        """Object arrays (which require pickle) must be rejected."""
+        buffer = BytesIO()
+        np.save(buffer, np.array([{"a": 1}], dtype=object), allow_pickle=True)
+        
+        response = SESSION.post(
+            DETECT_URL,
+            data=buffer.getvalue(),
+            headers=NPY_HEADERS,
             timeout=TIMEOUT
         )
         
-        assert response.status_code == 200
-        data = response.json()
-        
-        if data["num_faces"] > 0:
-            assert "annotated_image" in data
-            assert data["annotated_image"].startswith("data:image/jpeg;base64,")
+        assert response.status_code == 400
     
-    def test_detect_missing_image(self):
-        """Detect without image should return 400."""
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={"conf_threshold": 0.5},
+    def test_detect_rejects_npz_archive(self):
+        """An .npz archive is not an image array and must be rejected."""
+        buffer = BytesIO()
+        np.savez(buffer, image=np.zeros((32, 32, 3), dtype=np.uint8))
+        
+        response = SESSION.post(
+            DETECT_URL,
+            data=buffer.getvalue(),
+            headers=NPY_HEADERS,
             timeout=TIMEOUT
         )
         
         assert response.status_code == 400
-        data = response.json()
-        assert "error" in data
     
-    def test_detect_invalid_json(self):
-        """Detect with invalid JSON should return 400."""
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            data="not json",
-            headers={"Content-Type": "application/json"},
+    def test_detect_rejects_empty_npy(self):
+        """A zero-size array must be rejected before it reaches detection."""
+        buffer = BytesIO()
+        np.save(buffer, np.zeros((0, 0, 3), dtype=np.uint8))
+        
+        response = SESSION.post(
+            DETECT_URL,
+            data=buffer.getvalue(),
+            headers=NPY_HEADERS,
             timeout=TIMEOUT
         )
         
         assert response.status_code == 400
     
-    def test_detect_invalid_base64(self):
-        """Detect with invalid base64 should return 400."""
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={"image": "not-valid-base64!!!"},
+    @pytest.mark.parametrize(
+        "options,check",
+        [
+            ({"return_landmarks": True}, _check_landmarks),
+            ({"return_landmarks": False}, _check_no_landmarks),
+            ({"conf_threshold": 0.3}, _check_threshold),
+            ({"conf_threshold": 0.99}, _check_threshold),
+            ({"annotate": True}, _check_annotation),
+        ],
+        ids=["with_landmarks", "without_landmarks", "custom_threshold", "high_threshold", "with_annotation"],
+    )
+    def test_detect_face_options(self, face_image_single, options, check):
+        """Detect on the shared face image with each request option."""
+        response = SESSION.post(
+            DETECT_URL,
+            data=orjson.dumps({"image": JPEG_PREFIX + face_image_single, **options}),
+            headers=JSON_HEADERS,
             timeout=TIMEOUT
         )
         
-        assert response.status_code == 400
-        data = response.json()
-        assert "error" in data
+        assert response.status_code == 200
+        data = orjson.loads(response.content)
+        check(data, options)
 
 
 class TestAlignEndpoint:
     """Tests for the /v1/align endpoint."""
     
-    def test_align_faces(self):
+    def test_align_faces(self, face_image_pair):
         """Align faces in an image."""
-        image_b64 = create_face_image(num_faces=2)
-        
-        response = requests.post(
-            f"{BASE_URL}/v1/align",
-            json={"image": f"data:image/jpeg;base64,{image_b64}"},
+        response = SESSION.post(
+            ALIGN_URL,
+            data=image_body(face_image_pair),
+            headers=JSON_HEADERS,
             timeout=TIMEOUT
         )
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         
         assert "faces" in data
         assert "num_faces" in data
@@ -307,20 +462,24 @@ class TestAlignEndpoint:
             assert "bbox" in face
             assert "confidence" in face
             assert "aligned_image" in face
-            assert face["aligned_image"].startswith("data:image/jpeg;base64,")
+            assert face["aligned_image"].startswith(JPEG_PREFIX)
+            
+            # Aligned crops are 112x112 (ArcFace input size)
+            aligned = _b64_to_bgr(face["aligned_image"])
+            assert aligned is not None
+            assert aligned.shape == (112, 112, 3)
     
-    def test_align_returns_multiple_faces(self):
+    def test_align_returns_multiple_faces(self, face_image_pair):
         """Align should return all detected faces."""
-        image_b64 = create_face_image(num_faces=2)
-        
-        response = requests.post(
-            f"{BASE_URL}/v1/align",
-            json={"image": f"data:image/jpeg;base64,{image_b64}"},
+        response = SESSION.post(
+            ALIGN_URL,
+            data=image_body(face_image_pair),
+            headers=JSON_HEADERS,
             timeout=TIMEOUT
         )
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Mock model should return at least 1 face
         if data["num_faces"] > 0:
@@ -330,36 +489,30 @@ class TestAlignEndpoint:
             face_ids = [f["face_id"] for f in data["faces"]]
             assert face_ids == list(range(len(face_ids)))
     
-    def test_align_missing_image(self):
-        """Align without image should return 400."""
-        response = requests.post(
-            f"{BASE_URL}/v1/align",
-            json={},
+    def test_align_multipart_upload(self, default_test_image_bytes):
+        """Align should accept a raw multipart upload."""
+        response = SESSION.post(
+            ALIGN_URL,
+            files={"image": ("test.jpg", default_test_image_bytes, "image/jpeg")},
             timeout=TIMEOUT
         )
         
-        assert response.status_code == 400
-        data = response.json()
-        assert "error" in data
+        assert response.status_code == 200
+        data = orjson.loads(response.content)
+        assert data["num_faces"] == len(data["faces"])
 
 
 class TestPerformance:
     """Performance and stress tests."""
     
-    def test_inference_time(self):
+    def test_inference_time(self, default_upload):
         """Inference should complete in reasonable time."""
-        image_b64 = create_test_image()
-        
         start = time.time()
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={"image": f"data:image/jpeg;base64,{image_b64}"},
-            timeout=TIMEOUT
-        )
+        response = SESSION.post(DETECT_URL, timeout=TIMEOUT, **default_upload)
         elapsed = time.time() - start
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Should complete in under 5 seconds (even with model loading)
         assert elapsed < 5.0
@@ -367,24 +520,26 @@ class TestPerformance:
         # Reported inference time should be reasonable
         assert data["inference_time_ms"] < 2000  # 2 seconds
     
-    def test_concurrent_requests(self):
+    def test_concurrent_requests(self, default_test_image):
         """Service should handle multiple concurrent requests."""
-        import concurrent.futures
+        aiohttp = pytest.importorskip("aiohttp")
         
-        image_b64 = create_test_image()
+        body = image_body(default_test_image)
         
-        def send_request():
-            response = requests.post(
-                f"{BASE_URL}/v1/detect",
-                json={"image": f"data:image/jpeg;base64,{image_b64}"},
-                timeout=TIMEOUT
-            )
-            return response.status_code
+        async def send_request(session):
+            async with session.post(
+                DETECT_URL, data=body, headers=JSON_HEADERS
+            ) as response:
+                return response.status
         
-        # Send 5 concurrent requests
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(send_request) for _ in range(5)]
-            results = [f.result() for f in futures]
+        async def send_all():
+            connector = aiohttp.TCPConnector(limit=8)
+            timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                # Send 5 concurrent requests from a single event loop
+                return await asyncio.gather(*(send_request(session) for _ in range(5)))
+        
+        results = asyncio.run(send_all())
         
         # All should succeed
         assert all(status == 200 for status in results)
@@ -393,90 +548,78 @@ class TestPerformance:
 class TestEdgeCases:
     """Edge cases and boundary conditions."""
     
-    def test_detect_very_small_image(self):
+    def test_detect_very_small_image(self, small_upload):
         """Detect on very small image should not crash."""
-        image_b64 = create_test_image(width=32, height=32)
-        
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={"image": f"data:image/jpeg;base64,{image_b64}"},
-            timeout=TIMEOUT
-        )
+        response = SESSION.post(DETECT_URL, timeout=TIMEOUT, **small_upload)
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "faces" in data
     
-    def test_detect_large_image(self):
+    def test_detect_large_image(self, large_upload):
         """Detect on large image should not crash."""
-        image_b64 = create_test_image(width=1920, height=1080)
-        
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={"image": f"data:image/jpeg;base64,{image_b64}"},
-            timeout=TIMEOUT
-        )
+        response = SESSION.post(DETECT_URL, timeout=TIMEOUT, **large_upload)
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "faces" in data
     
-    def test_detect_png_image(self):
+    def test_detect_png_image(self, png_test_image):
         """Detect should work with PNG images."""
-        image_b64 = create_test_image(format="PNG")
-        
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={"image": f"data:image/png;base64,{image_b64}"},
+        response = SESSION.post(
+            DETECT_URL,
+            data=image_body(png_test_image, "png"),
+            headers=JSON_HEADERS,
             timeout=TIMEOUT
         )
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "faces" in data
-    
-    def test_detect_high_threshold(self):
-        """Detect with very high threshold should return fewer faces."""
-        image_b64 = create_face_image()
-        
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json={
-                "image": f"data:image/jpeg;base64,{image_b64}",
-                "conf_threshold": 0.99
-            },
-            timeout=TIMEOUT
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        
-        # All detected faces should meet high threshold
-        for face in data["faces"]:
-            assert face["confidence"] >= 0.99
 
 
 class TestErrorHandling:
     """Error handling and validation."""
     
-    def test_invalid_endpoint(self):
-        """Invalid endpoint should return 404."""
-        response = requests.get(f"{BASE_URL}/invalid", timeout=TIMEOUT)
-        assert response.status_code == 404
-    
-    def test_wrong_http_method(self):
-        """Wrong HTTP method should return 405 or similar."""
-        response = requests.get(f"{BASE_URL}/v1/detect", timeout=TIMEOUT)
-        assert response.status_code in [405, 400]
-    
-    def test_empty_post_body(self):
-        """Empty POST body should return 400."""
-        response = requests.post(
-            f"{BASE_URL}/v1/detect",
-            json=None,
-            timeout=TIMEOUT
-        )
-        assert response.status_code == 400
+    @pytest.mark.parametrize(
+        "method,url,kwargs,expected_status,expect_error_field",
+        [
+            # Detect without image should return 400
+            ("POST", DETECT_URL, {"data": orjson.dumps({"conf_threshold": 0.5}), "headers": JSON_HEADERS}, (400,), True),
+            # Detect with invalid JSON should return 400
+            ("POST", DETECT_URL, {"data": "not json", "headers": JSON_HEADERS}, (400,), False),
+            # Detect with invalid base64 should return 400
+            ("POST", DETECT_URL, {"data": orjson.dumps({"image": "not-valid-base64!!!"}), "headers": JSON_HEADERS}, (400,), True),
+            # Detect with a non-numeric multipart field should return 400
+            ("POST", DETECT_URL, {"data": {"conf_threshold": "high"}, "files": {"image": ("x.jpg", b"")}}, (400,), True),
+            # Align without image should return 400
+            ("POST", ALIGN_URL, {"data": orjson.dumps({}), "headers": JSON_HEADERS}, (400,), True),
+            # Empty POST body should return 400
+            ("POST", DETECT_URL, {}, (400,), False),
+            # Wrong HTTP method should return 405 or similar
+            ("GET", DETECT_URL, {}, (405, 400), False),
+            # Invalid endpoint should return 404
+            ("GET", f"{BASE_URL}/invalid", {}, (404,), False),
+        ],
+        ids=[
+            "detect_missing_image",
+            "detect_invalid_json",
+            "detect_invalid_base64",
+            "detect_invalid_form_number",
+            "align_missing_image",
+            "empty_post_body",
+            "wrong_http_method",
+            "invalid_endpoint",
+        ],
+    )
+    def test_error_response(self, method, url, kwargs, expected_status, expect_error_field):
+        """Malformed requests should fail with the expected status over the shared session."""
+        response = SESSION.request(method, url, timeout=TIMEOUT, **kwargs)
+        
+        assert response.status_code in expected_status
+        if expect_error_field:
+            data = orjson.loads(response.content)
+            assert "error" in data
 
 
 if __name__ == "__main__":
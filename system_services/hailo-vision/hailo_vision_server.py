@@ -7,29 +7,44 @@ Compatible with OpenAI Chat Completions API.
 """
 
 import asyncio
-import base64
+import binascii
+import functools
+import hashlib
 import io
 import json
 import logging
 import os
+import signal
 import sys
+import threading
 import time
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 try:
     from aiohttp import web
     import cv2
     import numpy as np
+    import orjson
     import requests
     import yaml
     from PIL import Image
+    from requests.adapters import HTTPAdapter
 except ImportError as e:
     print(f"Error: Missing required package: {e}")
-    print("Install with: pip3 install aiohttp pyyaml pillow numpy opencv-python requests")
+    print("Install with: pip3 install aiohttp pyyaml pillow numpy opencv-python requests orjson")
     sys.exit(1)
 
+try:
+    # SIMD (NEON/AVX2) base64; large inline data URIs decode several times faster
+    import pybase64
+    _b64decode = functools.partial(pybase64.b64decode, validate=False)
+except ImportError:
+    # The C decoder directly, without base64.b64decode's argument handling
+    _b64decode = binascii.a2b_base64
+
 try:
     from device_client import HailoDeviceClient
 except ImportError as e:
@@ -57,12 +72,42 @@ logger = logging.getLogger('hailo-vision')
 XDG_CONFIG_HOME = os.environ.get('XDG_CONFIG_HOME', '/etc/xdg')
 CONFIG_JSON = os.path.join(XDG_CONFIG_HOME, 'hailo-vision', 'hailo-vision.json')
 
+# Shared HTTP session for image URLs: keep-alive connection pooling avoids a
+# new TCP (and TLS) handshake per image when clients reuse the same host
+_HTTP_SESSION = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+_HTTP_SESSION.mount('http://', _HTTP_ADAPTER)
+_HTTP_SESSION.mount('https://', _HTTP_ADAPTER)
+
+# Qwen2-VL vision encoder input (width, height)
+VLM_INPUT_SIZE = (336, 336)
+# Frames stay 8-bit end to end; the NPU quantizes its own inputs, so
+# widening to float here would only multiply the bytes moved
+FRAME_DTYPE = np.uint8
+
+# Largest image body accepted from an image URL
+MAX_IMAGE_BYTES = 64 * 1024 * 1024
+# Largest accepted HTTP request body (inline base64 images)
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+# Most images accepted by one /v1/vision/analyze request
+MAX_ANALYZE_IMAGES = 16
+# Images of one analyze request decoded at a time; each holds a frame buffer
+# and its full-size decode until generation catches up
+ANALYZE_PREP_BATCH = 4
+_HTTP_CHUNK_BYTES = 64 * 1024
+_HTTP_SCHEMES = ('http://', 'https://')
+# (response header, conditional request header) pairs used to revalidate
+# cached frames
+_CACHE_VALIDATORS = (('ETag', 'If-None-Match'), ('Last-Modified', 'If-Modified-Since'))
+
 class VisionServiceConfig:
     """Configuration management."""
     
     def __init__(self):
         self.server_host = "0.0.0.0"
         self.server_port = 11435
+        self.max_concurrent_requests = 4
+        self.max_queued_requests = 8
         self.model_name = "qwen2-vl-2b-instruct"
         self.hef_path = None  # Will be resolved via hailo-apps
         self.keep_alive = -1
@@ -70,6 +115,8 @@ class VisionServiceConfig:
         self.max_tokens = 200
         self.top_p = 0.9
         self.seed = None
+        self.cache_enabled = True
+        self.cache_capacity = 128
         self._load_config()
     
     def _load_config(self):
@@ -86,6 +133,8 @@ class VisionServiceConfig:
             server = config.get('server', {})
             self.server_host = server.get('host', self.server_host)
             self.server_port = server.get('port', self.server_port)
+            self.max_concurrent_requests = server.get('max_concurrent_requests', self.max_concurrent_requests)
+            self.max_queued_requests = server.get('max_queued_requests', self.max_queued_requests)
             
             # Parse model config
             model = config.get('model', {})
@@ -100,99 +149,326 @@ class VisionServiceConfig:
             self.top_p = gen.get('top_p', self.top_p)
             self.seed = gen.get('seed', self.seed)
             
+            # Parse response cache config
+            cache = config.get('cache', {})
+            self.cache_enabled = cache.get('enabled', self.cache_enabled)
+            self.cache_capacity = cache.get('capacity', self.cache_capacity)
+            
             logger.info(f"Loaded config from {CONFIG_JSON}")
         except Exception as e:
             logger.error(f"Failed to load config: {e}")
             raise
 
-def decode_image_from_url(image_url: str) -> np.ndarray:
-    """Decode image from URL or base64 data URI."""
+_REDUCED_IMREAD_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def _imread_flag(image_data: bytes, target_size: tuple) -> int:
+    """Pick an OpenCV decode flag for the encoded image.
+
+    JPEGs are decoded by libjpeg at 1/2, 1/4 or 1/8 scale when the reduced
+    image is still at least twice the target size in both dimensions.
+    """
+    if not image_data.startswith(b'\xff\xd8'):
+        return cv2.IMREAD_COLOR
+    try:
+        # Parses the JPEG header only, no pixel decode
+        w, h = Image.open(io.BytesIO(image_data)).size
+    except Exception:
+        return cv2.IMREAD_COLOR
+    target_w, target_h = target_size
+    for factor, flag in _REDUCED_IMREAD_FLAGS:
+        if w // factor >= target_w * 2 and h // factor >= target_h * 2:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def decode_image_bytes(image_data: bytes, target_size: tuple = VLM_INPUT_SIZE) -> np.ndarray:
+    """Decode encoded image bytes straight to a BGR numpy array via OpenCV."""
+    image = cv2.imdecode(
+        np.frombuffer(image_data, np.uint8), _imread_flag(image_data, target_size)
+    )
+    if image is None:
+        raise ValueError("Failed to decode image")
+    return image
+
+
+def _fetch_image_bytes(
+    image_url: str, headers: Optional[Dict[str, str]] = None
+) -> Tuple[Optional[bytearray], Dict[str, str]]:
+    """Stream an HTTP(S) image body into a single buffer, capped at MAX_IMAGE_BYTES.
+
+    With a Content-Length (and no content encoding) the buffer is allocated
+    once at its final size and filled in place; oversized bodies are
+    rejected before anything is downloaded.
+
+    Returns the body (None on 304 Not Modified) and the response's cache
+    validators (ETag / Last-Modified) for conditional re-requests.
+    """
+    with _HTTP_SESSION.get(image_url, headers=headers, stream=True, timeout=10) as response:
+        response.raise_for_status()
+        validators = {
+            request_header: response.headers[response_header]
+            for response_header, request_header in _CACHE_VALIDATORS
+            if response_header in response.headers
+        }
+        if response.status_code == 304:
+            return None, validators
+        
+        length = response.headers.get('Content-Length', '')
+        encoding = response.headers.get('Content-Encoding', 'identity')
+        
+        if length.isdigit() and encoding == 'identity':
+            size = int(length)
+            if size > MAX_IMAGE_BYTES:
+                raise ValueError(f"Image too large: {size} bytes (max {MAX_IMAGE_BYTES})")
+            buf = bytearray(size)
+            view = memoryview(buf)
+            offset = 0
+            for chunk in response.iter_content(_HTTP_CHUNK_BYTES):
+                end = offset + len(chunk)
+                if end > size:
+                    raise ValueError("Image body longer than Content-Length")
+                view[offset:end] = chunk
+                offset = end
+            if offset != size:
+                raise ValueError(f"Image body truncated: {offset} of {size} bytes")
+            return buf, validators
+        
+        buf = bytearray()
+        for chunk in response.iter_content(_HTTP_CHUNK_BYTES):
+            buf += chunk
+            if len(buf) > MAX_IMAGE_BYTES:
+                raise ValueError(f"Image too large: more than {MAX_IMAGE_BYTES} bytes")
+        return buf, validators
+
+
+def decode_image_from_url(image_url: str, target_size: tuple = VLM_INPUT_SIZE) -> np.ndarray:
+    """Decode image from URL or base64 data URI.
+
+    Returns a BGR uint8 array (OpenCV channel order).
+    """
     
     if image_url.startswith('data:image'):
-        # Handle base64 data URI
-        header, encoded = image_url.split(',', 1)
-        image_data = base64.b64decode(encoded)
-        image = Image.open(io.BytesIO(image_data))
-        return np.array(image)
-    elif image_url.startswith('http://') or image_url.startswith('https://'):
+        # Handle base64 data URI. Slice once past the comma rather than
+        # splitting, which would also copy the header into a list.
+        comma = image_url.find(',', 10)
+        if comma < 0:
+            raise ValueError("Malformed data URI: no ',' before the payload")
+        image_data = _b64decode(image_url[comma + 1:])
+    elif image_url.startswith(_HTTP_SCHEMES):
         # Handle HTTP/HTTPS URL
-        response = requests.get(image_url, timeout=10)
-        response.raise_for_status()
-        image = Image.open(io.BytesIO(response.content))
-        return np.array(image)
-    elif image_url.startswith('file://'):
-        # Handle file:// URI
-        file_path = image_url[7:]  # Remove 'file://'
-        image = Image.open(file_path)
-        return np.array(image)
+        image_data, _ = _fetch_image_bytes(image_url)
     else:
-        # Assume it's a file path
-        image = Image.open(image_url)
-        return np.array(image)
+        # Handle file:// URI, or assume it's a file path
+        file_path = image_url[7:] if image_url.startswith('file://') else image_url
+        with open(file_path, 'rb') as f:
+            image_data = f.read()
+    return decode_image_bytes(image_data, target_size)
 
 
-def preprocess_image_for_vlm(image_array: np.ndarray, target_size: tuple = (336, 336)) -> np.ndarray:
+def preprocess_image_for_vlm(
+    image_array: np.ndarray,
+    target_size: tuple = VLM_INPUT_SIZE,
+    dst: Optional[np.ndarray] = None,
+) -> np.ndarray:
     """Preprocess image for VLM inference using central crop.
     
     Args:
-        image_array: Input image in any format (RGB, BGR, RGBA, etc.)
-        target_size: Target size (width, height), default (336, 336)
+        image_array: Input BGR image as decoded by cv2.imdecode
+        target_size: Target size (width, height), default VLM_INPUT_SIZE
+        dst: Optional preallocated (height, width, 3) uint8 output buffer
     
     Returns:
         Preprocessed RGB image as uint8 numpy array
     """
-    # Convert to RGB if needed
-    if len(image_array.shape) == 2:
-        # Grayscale to RGB
-        image_array = cv2.cvtColor(image_array, cv2.COLOR_GRAY2RGB)
-    elif len(image_array.shape) == 3:
-        if image_array.shape[2] == 4:
-            # RGBA to RGB
-            image_array = cv2.cvtColor(image_array, cv2.COLOR_RGBA2RGB)
-        elif image_array.shape[2] == 3:
-            # Assume BGR (OpenCV default) - convert to RGB
-            # PIL images are already RGB, but we can't tell, so we check pixel order
-            # Safe approach: always convert from BGR to RGB for consistency
-            image_array = cv2.cvtColor(image_array, cv2.COLOR_BGR2RGB)
-    
     h, w = image_array.shape[:2]
     target_w, target_h = target_size
     
     # Scale to cover the target size (Central Crop strategy)
     scale = max(target_w / w, target_h / h)
-    new_w = int(w * scale)
-    new_h = int(h * scale)
-    
-    # Resize the image
-    resized = cv2.resize(image_array, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
-    
-    # Center crop
-    x_start = (new_w - target_w) // 2
-    y_start = (new_h - target_h) // 2
-    cropped = resized[y_start:y_start+target_h, x_start:x_start+target_w]
-    
-    return cropped.astype(np.uint8)
-def encode_tensor(array: np.ndarray) -> Dict[str, Any]:
-    """Encode numpy array to base64 for transmission to device manager."""
-    return {
-        "dtype": str(array.dtype),
-        "shape": list(array.shape),
-        "data_b64": base64.b64encode(array.tobytes()).decode("ascii"),
-    }
+    
+    # Crop the centered source window first so only the pixels that end up
+    # in the output are resampled
+    crop_w = min(w, round(target_w / scale))
+    crop_h = min(h, round(target_h / scale))
+    x_start = (w - crop_w) // 2
+    y_start = (h - crop_h) // 2
+    roi = image_array[y_start:y_start+crop_h, x_start:x_start+crop_w]
+    
+    # INTER_AREA for downscaling, INTER_LINEAR for upscaling
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    resized = cv2.resize(roi, (target_w, target_h), dst=dst, interpolation=interpolation)
+    
+    # Convert to RGB after resizing: the channel swap commutes with the
+    # per-channel resample, so it only touches the small output instead of
+    # allocating a full-size copy. BGR (OpenCV default) to RGB, in place
+    cv2.cvtColor(resized, cv2.COLOR_BGR2RGB, dst=resized)
+    
+    return np.ascontiguousarray(resized, dtype=FRAME_DTYPE)
+
+
+class FrameCache:
+    """Thread-safe LRU of preprocessed frames for HTTP(S) image URLs.
+    
+    Only responses carrying an ETag or Last-Modified header are cached, and
+    every hit is revalidated with a conditional GET, so a changing URL
+    (e.g. a camera snapshot) is never served stale. A 304 skips the
+    download, decode and resize.
+    """
+    
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[Dict[str, str], np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, url: str) -> Optional[Tuple[Dict[str, str], np.ndarray]]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+    
+    def put(self, url: str, validators: Dict[str, str], frame: np.ndarray):
+        frame = frame.copy()
+        frame.setflags(write=False)
+        with self._lock:
+            self._entries[url] = (validators, frame)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+        return count
 
 
+def _preprocess_http_cached(
+    image_url: str, dst: Optional[np.ndarray], cache: FrameCache, target_size: tuple
+) -> np.ndarray:
+    cached = cache.get(image_url)
+    validators, frame = cached if cached is not None else ({}, None)
+    image_data, validators = _fetch_image_bytes(image_url, headers=validators)
+    if image_data is None and frame is not None:
+        logger.debug(f"Frame cache hit (not modified): {image_url}")
+        return frame
+    if image_data is None:
+        raise ValueError(f"Unexpected 304 Not Modified for {image_url}")
+    
+    frame = preprocess_image_for_vlm(
+        decode_image_bytes(image_data, target_size), target_size, dst=dst
+    )
+    if validators:
+        cache.put(image_url, validators, frame)
+    return frame
+
+
+def decode_and_preprocess(
+    image_url: str,
+    dst: Optional[np.ndarray] = None,
+    cache: Optional[FrameCache] = None,
+    target_size: tuple = VLM_INPUT_SIZE,
+) -> np.ndarray:
+    """Fetch/decode an image and preprocess it for the VLM (blocking)."""
+    if cache is not None and image_url.startswith(_HTTP_SCHEMES):
+        return _preprocess_http_cached(image_url, dst, cache, target_size)
+    
+    image_array = decode_image_from_url(image_url, target_size)
+    logger.debug(f"Image decoded: shape={image_array.shape}, dtype={image_array.dtype}")
+    return preprocess_image_for_vlm(image_array, target_size, dst=dst)
+
+
+class ResponseCache:
+    """LRU of generation results keyed by frame, prompt and parameters.
+    
+    The key hashes the preprocessed frame rather than the request's image
+    string, so the same picture sent as a data URI, a file path or a URL
+    maps to one entry. Only used from the event loop, so no locking.
+    """
+    
+    def __init__(self, capacity: int = 128):
+        self.capacity = capacity
+        self._entries: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+    
+    @staticmethod
+    def key(frame: np.ndarray, text_prompt: str, temperature: float, max_tokens: int, seed: Optional[int]) -> bytes:
+        digest = hashlib.sha256(frame.data)
+        digest.update(repr((text_prompt, temperature, max_tokens, seed)).encode("utf-8"))
+        return digest.digest()
+    
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+    
+    def put(self, key: bytes, result: Dict[str, Any]):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> int:
+        count = len(self._entries)
+        self._entries.clear()
+        return count
 
 
 class VisionService:
     """Vision inference service with model lifecycle management."""
     
+    # Identical for every request; shared so the prompt prefix is byte-stable
+    _SYSTEM_MSG = {
+        "role": "system",
+        "content": [{"type": "text", "text": "You are a helpful assistant that analyzes images and answers questions about them."}]
+    }
+    
     def __init__(self, config: VisionServiceConfig):
         self.config = config
         self.client: Optional[HailoDeviceClient] = None
         self.is_loaded = False
         self.load_time_ms = 0
-        self.startup_time = datetime.utcnow()
+        self.startup_time = time.time()
+        self._startup_epoch = int(self.startup_time)
+        self._startup_monotonic = time.monotonic()
         self.hef_path = None
+        self._hef_path_str: Optional[str] = None
+        # Image fetch/decode/resize runs here, off the event loop; PIL and
+        # OpenCV release the GIL, so threads use all cores
+        self._prep_pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count(), thread_name_prefix="vision-prep"
+        )
+        # Recycled VLM input frame buffers. A buffer is checked out on the
+        # event loop for one request and only returned once inference is done,
+        # since infer_binary sends it without copying.
+        self._frame_bufs: List[np.ndarray] = []
+        # Preprocessed frames for repeatedly requested image URLs
+        self._frame_cache = FrameCache(maxsize=64)
+        # Request slots bound in-flight requests (and so request bodies,
+        # frame buffers and queued NPU work). Up to max_queued_requests more
+        # wait for a slot; beyond that requests are shed.
+        slots = max(1, config.max_concurrent_requests)
+        self._slots = asyncio.Semaphore(slots)
+        self._admission_limit = slots + max(0, config.max_queued_requests)
+        self._admitted = 0
+        # Completed generations for repeated identical queries
+        self._response_cache: Optional[ResponseCache] = None
+        if config.cache_enabled and config.cache_capacity > 0:
+            self._response_cache = ResponseCache(config.cache_capacity)
+        # Generations currently running on the NPU, by ResponseCache key
+        self._inflight: Dict[bytes, "asyncio.Future[Dict[str, Any]]"] = {}
+        # The input shape is fixed for the service's lifetime; bind it (and
+        # the cache) once instead of passing them on every request
+        target_w, target_h = VLM_INPUT_SIZE
+        self._frame_shape = (target_h, target_w, 3)
+        self._decode_and_preprocess = functools.partial(
+            decode_and_preprocess, cache=self._frame_cache, target_size=VLM_INPUT_SIZE
+        )
     
     async def initialize(self):
         """Initialize model and prepare for inference."""
@@ -211,6 +487,8 @@ class VisionService:
                 raise RuntimeError("Failed to resolve HEF model path. Model may need to be downloaded.")
             
             logger.info(f"Using HEF model: {self.hef_path}")
+            # Sent with every request; convert the Path once
+            self._hef_path_str = str(self.hef_path)
             
             logger.info("Connecting to device manager...")
             timeout_env = os.environ.get("HAILO_DEVICE_TIMEOUT", "120")
@@ -223,9 +501,14 @@ class VisionService:
 
             logger.info("Loading VLM model via device manager...")
             start_time = time.time()
-            await self.client.load_model(str(self.hef_path), model_type="vlm_chat")
+            load_response = await self.client.load_model(self._hef_path_str, model_type="vlm_chat")
             self.load_time_ms = int((time.time() - start_time) * 1000)
-            logger.info(f"VLM model loaded successfully in {self.load_time_ms}ms")
+            # The device manager outlives this service, so a restart usually
+            # finds the model still configured on the NPU
+            if load_response.get("message") == "Model already loaded":
+                logger.info(f"VLM model already resident in device manager (warm start, {self.load_time_ms}ms)")
+            else:
+                logger.info(f"VLM model loaded successfully in {self.load_time_ms}ms")
             
             self.is_loaded = True
             
@@ -239,6 +522,151 @@ class VisionService:
                     pass
             raise
     
+    def _check_ready(self):
+        if not self.is_loaded:
+            raise RuntimeError("Model not loaded")
+        if not self.client:
+            raise RuntimeError("Device manager client not initialized")
+    
+    async def acquire_slot(self) -> bool:
+        """Wait for a request slot; False at once when the wait queue is full.
+        
+        The request is counted before the first await, so a burst of
+        requests cannot all pass the check before any of them is counted.
+        """
+        if self._admitted >= self._admission_limit:
+            return False
+        self._admitted += 1
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            self._admitted -= 1
+            raise
+        return True
+    
+    def release_slot(self):
+        self._slots.release()
+        self._admitted -= 1
+    
+    def _acquire_frame_buf(self) -> np.ndarray:
+        if self._frame_bufs:
+            return self._frame_bufs.pop()
+        return np.empty(self._frame_shape, dtype=FRAME_DTYPE)
+    
+    def _release_frame_bufs(self, bufs: List[np.ndarray]):
+        self._frame_bufs.extend(bufs)
+    
+    async def _preprocess(self, image_url: str, dst: np.ndarray) -> np.ndarray:
+        """Load, decode and preprocess image from URL/base64 in the worker pool."""
+        logger.debug(f"Decoding image from URL (length: {len(image_url)} chars)")
+        loop = asyncio.get_running_loop()
+        preprocessed_image = await loop.run_in_executor(
+            self._prep_pool, self._decode_and_preprocess, image_url, dst
+        )
+        logger.debug(f"Image preprocessed: shape={preprocessed_image.shape}")
+        return preprocessed_image
+    
+    async def _generate(
+        self,
+        preprocessed_image: np.ndarray,
+        text_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        seed: int
+    ) -> Dict[str, Any]:
+        """Run VLM generation for one preprocessed image.
+        
+        Reproducible requests (a fixed seed or greedy decoding) are cached,
+        and concurrent identical ones share a single NPU generation. Sampled
+        output must stay random, so it is never cached or shared.
+        """
+        if seed is None and temperature != 0:
+            return await self._infer(preprocessed_image, text_prompt, temperature, max_tokens, seed)
+        
+        # Hashing the whole frame is the last per-image CPU step; hashlib
+        # releases the GIL, so run it in the prep pool with the decode
+        key = await asyncio.get_running_loop().run_in_executor(
+            self._prep_pool, ResponseCache.key,
+            preprocessed_image, text_prompt, temperature, max_tokens, seed,
+        )
+        if self._response_cache is not None:
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                logger.debug("Response cache hit")
+                return {**cached, "inference_time_ms": 0}
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.debug("Joining in-flight generation")
+            return {**(await asyncio.shield(inflight)), "inference_time_ms": 0}
+        
+        task = asyncio.ensure_future(
+            self._infer(preprocessed_image, text_prompt, temperature, max_tokens, seed)
+        )
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so a cancelled first caller does not fail the joiners
+        result = await asyncio.shield(task)
+        if self._response_cache is not None:
+            self._response_cache.put(key, result)
+        return result
+    
+    async def _infer(
+        self,
+        preprocessed_image: np.ndarray,
+        text_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        seed: int
+    ) -> Dict[str, Any]:
+        # 3. Prepare prompt in VLM format
+        prompt = [
+            self._SYSTEM_MSG,
+            {
+                "role": "user",
+                "content": [
+                    {"type": "image"},
+                    {"type": "text", "text": text_prompt}
+                ]
+            }
+        ]
+        
+        # 4. Run inference on NPU via HailoRT
+        logger.debug(f"Running VLM inference with prompt: '{text_prompt}'")
+        
+        response = await self.client.infer_binary(
+            self._hef_path_str,
+            {
+                "prompt": prompt,
+                "temperature": temperature,
+                "seed": seed,
+                "max_generated_tokens": max_tokens,
+            },
+            {"frames": [preprocessed_image]},
+            model_type="vlm_chat",
+        )
+        
+        inference_time_ms = response.get("inference_time_ms")
+        response_text = response.get("result", "")
+        
+        # 5. Parse response (remove special tokens)
+        # VLM output may contain special tokens like <|im_end|>
+        cleaned_response = response_text.partition("<|im_end|>")[0].strip()
+        
+        # Prefer the runtime's token count; otherwise estimate ~4 UTF-8 bytes
+        # per token (char counts undercount non-ASCII text)
+        tokens_generated = response.get("tokens_generated")
+        if tokens_generated is None:
+            tokens_generated = (len(cleaned_response.encode("utf-8")) + 3) // 4
+        
+        logger.info(f"VLM inference completed in {inference_time_ms}ms, generated ~{tokens_generated} tokens")
+        
+        return {
+            "content": cleaned_response,
+            "tokens_generated": tokens_generated,
+            "inference_time_ms": inference_time_ms
+        }
+    
     async def process_image(
         self,
         image_url: str,
@@ -248,12 +676,12 @@ class VisionService:
         top_p: float = None,
         seed: int = None
     ) -> Dict[str, Any]:
-        """Process image with text prompt via VLM."""
+        """Process image with text prompt via VLM.
         
-        if not self.is_loaded:
-            raise RuntimeError("Model not loaded")
-        if not self.client:
-            raise RuntimeError("Device manager client not initialized")
+        The caller holds a request slot (see acquire_slot).
+        """
+        
+        self._check_ready()
         
         # Use config defaults if not provided
         temperature = temperature if temperature is not None else self.config.temperature
@@ -261,71 +689,82 @@ class VisionService:
         top_p = top_p if top_p is not None else self.config.top_p
         seed = seed if seed is not None else self.config.seed
         
+        bufs = [self._acquire_frame_buf()]
         try:
-            # 1. Load and decode image from URL/base64
-            logger.debug(f"Decoding image from URL (length: {len(image_url)} chars)")
-            image_array = decode_image_from_url(image_url)
-            logger.debug(f"Image decoded: shape={image_array.shape}, dtype={image_array.dtype}")
-            
-            # 2. Preprocess image for VLM
-            logger.debug("Preprocessing image for VLM...")
-            preprocessed_image = preprocess_image_for_vlm(image_array)
-            logger.debug(f"Image preprocessed: shape={preprocessed_image.shape}")
-            
-            # 3. Prepare prompt in VLM format
-            prompt = [
-                {
-                    "role": "system",
-                    "content": [{"type": "text", "text": "You are a helpful assistant that analyzes images and answers questions about them."}]
-                },
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "image"},
-                        {"type": "text", "text": text_prompt}
-                    ]
-                }
-            ]
-            
-            # 4. Run inference on NPU via HailoRT
-            logger.debug(f"Running VLM inference with prompt: '{text_prompt}'")
-            start_time = time.time()
-            
-            response = await self.client.infer(
-                str(self.hef_path),
-                {
-                    "prompt": prompt,
-                    "frames": [encode_tensor(preprocessed_image)],
-                    "temperature": temperature,
-                    "seed": seed,
-                    "max_generated_tokens": max_tokens,
-                },
-                model_type="vlm_chat",
-            )
-            
-            inference_time_ms = response.get("inference_time_ms")
-            response_text = response.get("result", "")
-            
-            # 5. Parse response (remove special tokens)
-            # VLM output may contain special tokens like <|im_end|>
-            cleaned_response = response_text.split("<|im_end|>")[0].strip()
-            
-            # Estimate token count (rough approximation: ~4 chars per token)
-            tokens_generated = len(cleaned_response) // 4
-            
-            logger.info(f"VLM inference completed in {inference_time_ms}ms, generated ~{tokens_generated} tokens")
-            
-            response = {
-                "content": cleaned_response,
-                "tokens_generated": tokens_generated,
-                "inference_time_ms": inference_time_ms
-            }
-            
-            return response
-            
+            preprocessed_image = await self._preprocess(image_url, bufs[0])
+            return await self._generate(preprocessed_image, text_prompt, temperature, max_tokens, seed)
+        
+        except asyncio.CancelledError:
+            # A worker thread may still be writing into the buffer
+            bufs = []
+            raise
+        except Exception as e:
+            logger.error(f"Inference failed: {e}", exc_info=True)
+            raise
+        finally:
+            self._release_frame_bufs(bufs)
+    
+    async def process_images(
+        self,
+        image_urls: List[str],
+        text_prompt: str,
+        temperature: float = None,
+        max_tokens: int = None,
+        top_p: float = None,
+        seed: int = None
+    ) -> List[Dict[str, Any]]:
+        """Process several images with the same text prompt via VLM.
+        
+        Images are fetched and preprocessed concurrently in the worker pool,
+        ANALYZE_PREP_BATCH at a time, then generated one by one: a
+        multi-frame VLM prompt would produce a single combined answer rather
+        than one per image. Each batch reuses the same frame buffers. The
+        caller holds a request slot (see acquire_slot).
+        """
+        
+        self._check_ready()
+        
+        # Use config defaults if not provided
+        temperature = temperature if temperature is not None else self.config.temperature
+        max_tokens = max_tokens if max_tokens is not None else self.config.max_tokens
+        top_p = top_p if top_p is not None else self.config.top_p
+        seed = seed if seed is not None else self.config.seed
+        
+        bufs = [
+            self._acquire_frame_buf()
+            for _ in range(min(len(image_urls), ANALYZE_PREP_BATCH))
+        ]
+        try:
+            results = []
+            for start in range(0, len(image_urls), ANALYZE_PREP_BATCH):
+                batch = image_urls[start:start + ANALYZE_PREP_BATCH]
+                preprocessed_images = await asyncio.gather(
+                    *(self._preprocess(image_url, buf) for image_url, buf in zip(batch, bufs))
+                )
+                # Generation is done with a frame before the next batch
+                # overwrites its buffer
+                for preprocessed_image in preprocessed_images:
+                    results.append(
+                        await self._generate(preprocessed_image, text_prompt, temperature, max_tokens, seed)
+                    )
+            return results
+        
+        except asyncio.CancelledError:
+            # Worker threads may still be writing into the buffers
+            bufs = []
+            raise
         except Exception as e:
             logger.error(f"Inference failed: {e}", exc_info=True)
+            # gather() does not wait for the other workers when one fails
+            bufs = []
             raise
+        finally:
+            self._release_frame_bufs(bufs)
+    
+    def clear_caches(self) -> Dict[str, int]:
+        """Drop cached responses and frames; returns how many were dropped."""
+        responses = self._response_cache.clear() if self._response_cache is not None else 0
+        return {"responses": responses, "frames": self._frame_cache.clear()}
     
     async def shutdown(self):
         """Unload model and clean up resources."""
@@ -340,116 +779,256 @@ class VisionService:
             finally:
                 self.client = None
         
+        self._prep_pool.shutdown(wait=False, cancel_futures=True)
         self.is_loaded = False
         logger.info("Shutdown complete")
 
+def _image_url_item(item: Dict[str, Any]) -> Optional[str]:
+    img_url_obj = item.get("image_url", {})
+    return img_url_obj.get("url") if type(img_url_obj) is dict else img_url_obj
+
+
+def _image_item(item: Dict[str, Any]) -> Optional[str]:
+    # Support bundled base64 or source
+    data = item.get("image") or item.get("data") or item.get("source")
+    # If it doesn't have the prefix, add it if it looks like base64
+    if data and type(data) is str and not data.startswith('data:'):
+        return f"data:image/jpeg;base64,{data}"
+    return data
+
+
+# Content item type -> reader returning the item's image URL (or None)
+_IMAGE_ITEM_READERS = {
+    "image_url": _image_url_item,
+    "image": _image_item,
+}
+
+
+def _extract_image_and_text(messages: List[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
+    """Find the image URL and text prompt in OpenAI-style chat messages.
+    
+    The last image and the last text in user messages win. Messages and
+    content items are scanned newest first, so the scan stops as soon as
+    both have been found.
+    """
+    image_url = None
+    text_prompt = None
+    image_readers = _IMAGE_ITEM_READERS
+    
+    for msg in reversed(messages):
+        if msg.get("role") != "user":
+            continue
+        content = msg.get("content", [])
+        content_type = type(content)
+        if content_type is str:
+            if text_prompt is None:
+                text_prompt = content
+                if image_url is not None:
+                    break
+        elif content_type is list:
+            for item in reversed(content):
+                item_type = item.get("type")
+                if item_type == "text":
+                    if text_prompt is None:
+                        text_prompt = item.get("text", "")
+                elif image_url is None:
+                    reader = image_readers.get(item_type)
+                    if reader is not None:
+                        image_url = reader(item) or None
+                if image_url is not None and text_prompt is not None:
+                    return image_url, text_prompt
+    
+    return image_url, text_prompt
+
+
+def json_response(payload: Any, status: int = 200) -> web.Response:
+    """Serialize a response payload with orjson."""
+    return web.Response(
+        body=orjson.dumps(payload),
+        status=status,
+        content_type='application/json',
+    )
+
+
+def _invalid_request_body(message: str) -> bytes:
+    return orjson.dumps({"error": {"message": message, "type": "invalid_request_error"}})
+
+
+# Fixed validation failures, serialized once
+_ERR_MISSING_MODEL = _invalid_request_body("Missing 'model' field")
+_ERR_MISSING_MESSAGES = _invalid_request_body("Missing 'messages' field")
+_ERR_MISSING_IMAGE_OR_TEXT = _invalid_request_body("Message must contain both image and text")
+_ERR_MISSING_IMAGES = _invalid_request_body("Missing 'images' field")
+_ERR_MISSING_PROMPT = _invalid_request_body("Missing 'prompt' field")
+_ERR_TOO_MANY_IMAGES = _invalid_request_body(
+    f"'images' accepts at most {MAX_ANALYZE_IMAGES} entries per request"
+)
+_ERR_NOT_OBJECT = _invalid_request_body("Request body must be a JSON object")
+_ERR_BUSY = orjson.dumps({"error": {"message": "Server busy, retry later", "type": "server_busy"}})
+
+
+# (required field, error body) per endpoint, checked in order
+_CHAT_REQUIRED_FIELDS = (
+    ("model", _ERR_MISSING_MODEL),
+    ("messages", _ERR_MISSING_MESSAGES),
+)
+_ANALYZE_REQUIRED_FIELDS = (
+    ("images", _ERR_MISSING_IMAGES),
+    ("prompt", _ERR_MISSING_PROMPT),
+)
+
+
+def _validate_payload(payload: Any, required_fields: Tuple[Tuple[str, bytes], ...]) -> Optional[bytes]:
+    """Return the error body for the first failed check, or None."""
+    if type(payload) is not dict:
+        return _ERR_NOT_OBJECT
+    get = payload.get
+    for field, error in required_fields:
+        if not get(field):
+            return error
+    return None
+
+
+def error_response(body: bytes, status: int = 400) -> web.Response:
+    """Return a pre-serialized JSON error body."""
+    return web.Response(body=body, status=status, content_type='application/json')
+
+
+def busy_response() -> web.Response:
+    """503 with a retry hint for when every slot and queue place is taken."""
+    response = error_response(_ERR_BUSY, status=503)
+    response.headers['Retry-After'] = '1'
+    return response
+
+
+async def read_request_body(request: web.Request):
+    """Read a request body, capped at MAX_REQUEST_BYTES.
+    
+    With a Content-Length (and no content encoding) the body is streamed
+    into a buffer allocated once at its final size, instead of collecting
+    chunks and joining them into a second copy.
+    """
+    size = request.content_length
+    if size is None or request.headers.get('Content-Encoding', 'identity') != 'identity':
+        return await request.read()
+    if size > MAX_REQUEST_BYTES:
+        raise web.HTTPRequestEntityTooLarge(max_size=MAX_REQUEST_BYTES, actual_size=size)
+    buf = bytearray(size)
+    view = memoryview(buf)
+    offset = 0
+    async for chunk in request.content.iter_chunked(_HTTP_CHUNK_BYTES):
+        end = offset + len(chunk)
+        if end > size:
+            raise web.HTTPBadRequest(text="Request body longer than Content-Length")
+        view[offset:end] = chunk
+        offset = end
+    if offset != size:
+        raise web.HTTPBadRequest(text=f"Request body truncated: {offset} of {size} bytes")
+    return buf
+
+
+def _holds_request_slot(handler):
+    """Run an inference handler in a request slot, or shed it with 503.
+    
+    The slot is taken before the potentially large body is read and held
+    until the response is ready. Requests that find the wait queue full
+    are shed.
+    """
+    @functools.wraps(handler)
+    async def wrapper(self, request: web.Request) -> web.Response:
+        if not await self.service.acquire_slot():
+            return busy_response()
+        try:
+            return await handler(self, request)
+        finally:
+            self.service.release_slot()
+    return wrapper
+
+
 class APIHandler:
     """HTTP API request handlers."""
     
     def __init__(self, service: VisionService):
         self.service = service
+        # The model list never changes after startup; serialize it once
+        self._models_body = orjson.dumps({
+            "data": [
+                {
+                    "id": service.config.model_name,
+                    "object": "model",
+                    "created": service._startup_epoch,
+                    "owned_by": "hailo"
+                }
+            ],
+            "object": "list"
+        })
+        # Only model_loaded and uptime_seconds change between probes
+        self._health = {
+            "status": "ok",
+            "model": service.config.model_name,
+            "model_loaded": False,
+            "uptime_seconds": 0.0
+        }
+        self._ready_body = orjson.dumps({"ready": True})
+        self._not_ready_body = orjson.dumps({"ready": False, "reason": "model_loading"})
     
     async def health(self, request: web.Request) -> web.Response:
         """GET /health - Service status."""
-        return web.json_response({
-            "status": "ok",
-            "model": self.service.config.model_name,
-            "model_loaded": self.service.is_loaded,
-            "uptime_seconds": (datetime.utcnow() - self.service.startup_time).total_seconds()
-        })
+        health = self._health
+        health["model_loaded"] = self.service.is_loaded
+        health["uptime_seconds"] = time.monotonic() - self.service._startup_monotonic
+        return json_response(health)
     
     async def health_ready(self, request: web.Request) -> web.Response:
         """GET /health/ready - Readiness probe."""
         if self.service.is_loaded:
-            return web.json_response({"ready": True})
+            return web.Response(body=self._ready_body, content_type='application/json')
         else:
-            return web.json_response(
-                {"ready": False, "reason": "model_loading"},
-                status=503
+            return web.Response(
+                body=self._not_ready_body,
+                status=503,
+                content_type='application/json'
             )
     
     async def list_models(self, request: web.Request) -> web.Response:
         """GET /v1/models - List available models."""
-        return web.json_response({
-            "data": [
-                {
-                    "id": self.service.config.model_name,
-                    "object": "model",
-                    "created": int(self.service.startup_time.timestamp()),
-                    "owned_by": "hailo"
-                }
-            ],
-            "object": "list"
-        })
+        return web.Response(body=self._models_body, content_type='application/json')
+    
+    async def clear_cache(self, request: web.Request) -> web.Response:
+        """DELETE /admin/cache - Drop cached responses and frames."""
+        cleared = self.service.clear_caches()
+        logger.info(f"Caches cleared: {cleared}")
+        return json_response({"cleared": cleared})
     
+    @_holds_request_slot
     async def chat_completions(self, request: web.Request) -> web.Response:
         """POST /v1/chat/completions - Vision inference."""
         
         try:
-            payload = await request.json()
+            payload = orjson.loads(await read_request_body(request))
+        except web.HTTPException:
+            # 413 and truncated-body errors keep their own status
+            raise
         except Exception as e:
-            return web.json_response(
+            return json_response(
                 {"error": {"message": f"Invalid JSON: {e}", "type": "invalid_request_error"}},
                 status=400
             )
         
         # Validate required fields
-        model = payload.get("model")
-        messages = payload.get("messages", [])
-        stream = payload.get("stream", False)
-        
-        if not model:
-            return web.json_response(
-                {"error": {"message": "Missing 'model' field", "type": "invalid_request_error"}},
-                status=400
-            )
-        
-        if not messages:
-            return web.json_response(
-                {"error": {"message": "Missing 'messages' field", "type": "invalid_request_error"}},
-                status=400
-            )
+        error = _validate_payload(payload, _CHAT_REQUIRED_FIELDS)
+        if error is not None:
+            return error_response(error)
+        model = payload["model"]
+        messages = payload["messages"]
         
         # Extract image and text from messages
-        image_url = None
-        text_prompt = None
-        
         logger.debug(f"Parsing {len(messages)} messages for content")
-        for msg in messages:
-            if msg.get("role") == "user":
-                content = msg.get("content", [])
-                if isinstance(content, str):
-                    text_prompt = content
-                    logger.debug(f"Found string text prompt: {text_prompt[:50]}...")
-                elif isinstance(content, list):
-                    for item in content:
-                        item_type = item.get("type")
-                        if item_type == "image_url":
-                            img_url_obj = item.get("image_url", {})
-                            url = img_url_obj.get("url") if isinstance(img_url_obj, dict) else img_url_obj
-                            if url:
-                                image_url = url
-                                logger.debug(f"Found image_url item: {image_url[:50]}...")
-                        elif item_type == "image":
-                            # Support bundled base64 or source
-                            data = item.get("image") or item.get("data") or item.get("source")
-                            if data:
-                                # If it doesn't have the prefix, add it if it looks like base64
-                                if isinstance(data, str) and not data.startswith('data:'):
-                                    image_url = f"data:image/jpeg;base64,{data}"
-                                else:
-                                    image_url = data
-                                logger.debug(f"Found bundled image item: {image_url[:50]}...")
-                        elif item_type == "text":
-                            text_prompt = item.get("text", "")
-                            logger.debug(f"Found text item: {text_prompt[:50]}...")
-        
-        if not image_url or not text_prompt:
+        image_url, text_prompt = _extract_image_and_text(messages)
+        
+        if not (image_url and text_prompt):
             logger.warning(f"Incomplete request: image_url={'found' if image_url else 'missing'}, text_prompt={'found' if text_prompt else 'missing'}")
-            return web.json_response(
-                {"error": {"message": "Message must contain both image and text", "type": "invalid_request_error"}},
-                status=400
-            )
+            return error_response(_ERR_MISSING_IMAGE_OR_TEXT)
         
         # Extract generation parameters
         temperature = payload.get("temperature", self.service.config.temperature)
@@ -468,10 +1047,11 @@ class APIHandler:
                 seed=seed
             )
             
+            now = time.time()
             response = {
-                "id": f"chatcmpl-{datetime.utcnow().timestamp()}",
+                "id": f"chatcmpl-{now}",
                 "object": "chat.completion",
-                "created": int(datetime.utcnow().timestamp()),
+                "created": int(now),
                 "model": model,
                 "choices": [
                     {
@@ -494,40 +1074,37 @@ class APIHandler:
                 }
             }
             
-            return web.json_response(response)
+            return json_response(response)
             
         except Exception as e:
             logger.error(f"Inference error: {e}")
-            return web.json_response(
+            return json_response(
                 {"error": {"message": str(e), "type": "internal_error"}},
                 status=500
             )
 
+    @_holds_request_slot
     async def analyze(self, request: web.Request) -> web.Response:
         """POST /v1/vision/analyze - Batch image analysis."""
         
         try:
-            payload = await request.json()
+            payload = orjson.loads(await read_request_body(request))
+        except web.HTTPException:
+            # 413 and truncated-body errors keep their own status
+            raise
         except Exception as e:
-            return web.json_response(
+            return json_response(
                 {"error": {"message": f"Invalid JSON: {e}", "type": "invalid_request_error"}},
                 status=400
             )
         
-        images = payload.get("images", [])
-        prompt = payload.get("prompt")
-        
-        if not images:
-            return web.json_response(
-                {"error": {"message": "Missing 'images' field", "type": "invalid_request_error"}},
-                status=400
-            )
-        
-        if not prompt:
-            return web.json_response(
-                {"error": {"message": "Missing 'prompt' field", "type": "invalid_request_error"}},
-                status=400
-            )
+        error = _validate_payload(payload, _ANALYZE_REQUIRED_FIELDS)
+        if error is not None:
+            return error_response(error)
+        images = payload["images"]
+        if len(images) > MAX_ANALYZE_IMAGES:
+            return error_response(_ERR_TOO_MANY_IMAGES)
+        prompt = payload["prompt"]
         
         # Extract generation parameters
         temperature = payload.get("temperature", self.service.config.temperature)
@@ -537,27 +1114,27 @@ class APIHandler:
         total_inference_time = 0
         
         try:
-            for image_url in images:
-                result = await self.service.process_image(
-                    image_url=image_url,
-                    text_prompt=prompt,
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                )
+            analyses = await self.service.process_images(
+                image_urls=images,
+                text_prompt=prompt,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            for image_url, result in zip(images, analyses):
                 results.append({
                     "image_url": image_url[:100] + "..." if len(image_url) > 100 else image_url,
                     "analysis": result["content"]
                 })
                 total_inference_time += result["inference_time_ms"]
             
-            return web.json_response({
+            return json_response({
                 "results": results,
                 "total_inference_time_ms": total_inference_time
             })
             
         except Exception as e:
             logger.error(f"Analysis error: {e}")
-            return web.json_response(
+            return json_response(
                 {"error": {"message": str(e), "type": "internal_error"}},
                 status=500
             )
@@ -566,7 +1143,7 @@ async def create_app(service: VisionService) -> web.Application:
     """Create aiohttp application."""
     handler = APIHandler(service)
     # Increase client_max_size to handle large images (64MB)
-    app = web.Application(client_max_size=1024**2 * 64)
+    app = web.Application(client_max_size=MAX_REQUEST_BYTES)
     
     # Routes
     app.router.add_get('/health', handler.health)
@@ -574,11 +1151,14 @@ async def create_app(service: VisionService) -> web.Application:
     app.router.add_get('/v1/models', handler.list_models)
     app.router.add_post('/v1/chat/completions', handler.chat_completions)
     app.router.add_post('/v1/vision/analyze', handler.analyze)
+    app.router.add_delete('/admin/cache', handler.clear_cache)
     
     return app
 
 async def main():
     """Main entry point."""
+    service = None
+    runner = None
     try:
         # Load configuration
         config = VisionServiceConfig()
@@ -599,9 +1179,13 @@ async def main():
         
         logger.info(f"Service ready at http://{config.server_host}:{config.server_port}")
         
-        # Keep running
-        while True:
-            await asyncio.sleep(3600)
+        # Run until systemd (SIGTERM) or the console (SIGINT) asks us to stop
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+        await stop.wait()
+        logger.info("Shutdown signal received")
     
     except KeyboardInterrupt:
         logger.info("Shutdown signal received")
@@ -609,7 +1193,17 @@ async def main():
         logger.error(f"Fatal error: {e}", exc_info=True)
         sys.exit(1)
     finally:
-        await service.shutdown()
+        if runner is not None:
+            await runner.cleanup()
+        if service is not None:
+            await service.shutdown()
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    try:
+        # libuv-based event loop; noticeably faster HTTP handling than the
+        # default selector loop
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -5,12 +5,37 @@ Supports image classification by URL, local file, or text-only chat completion.
 """
 
 import argparse
-import base64
+import asyncio
+import binascii
 import json
+import mmap
 import os
-import requests
 
-def main():
+import aiohttp
+
+
+# Multiple of 3, so encoded chunks concatenate without padding in between
+B64_CHUNK_BYTES = 57000
+
+
+def _read_b64(path):
+    """Base64-encode a file from an mmap, one chunk at a time."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                chunks = [
+                    binascii.b2a_base64(view[i:i + B64_CHUNK_BYTES], newline=False)
+                    for i in range(0, len(view), B64_CHUNK_BYTES)
+                ]
+            finally:
+                view.release()
+    return b"".join(chunks).decode("ascii")
+
+
+async def main():
     parser = argparse.ArgumentParser(
         description="Unified test script for Hailo Vision service",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -54,8 +79,8 @@ Examples:
         if not os.path.exists(args.input):
             print(f"Error: File not found: {args.input}")
             return
-        with open(args.input, "rb") as f:
-            img_b64 = base64.b64encode(f.read()).decode()
+        # Encode off the event loop; large images take a while
+        img_b64 = await asyncio.to_thread(_read_b64, args.input)
         ext = os.path.splitext(args.input)[1].lower()
         mime = "image/png" if ext == ".png" else "image/jpeg"
         payload = {
@@ -86,16 +111,20 @@ Examples:
         }
 
     print(f"Submitting request in mode '{args.mode}' with input: {args.input}")
+    connector = aiohttp.TCPConnector(limit=1, keepalive_timeout=30)
     try:
-        response = requests.post(BASE_URL, json=payload, timeout=90)
-        if response.status_code == 200:
-            result = response.json()
-            print("\n--- Response ---")
-            print(json.dumps(result, indent=2))
-        else:
-            print(f"Error {response.status_code}: {response.text}")
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async with session.post(
+                BASE_URL, json=payload, timeout=aiohttp.ClientTimeout(total=90)
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    print("\n--- Response ---")
+                    print(json.dumps(result, indent=2))
+                else:
+                    print(f"Error {response.status}: {await response.text()}")
     except Exception as e:
         print(f"Request Error: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
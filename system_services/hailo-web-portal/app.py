@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import base64
-import io
+import functools
+import itertools
 import os
 import re
 import tempfile
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import gradio as gr
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from PIL import Image
+from fastapi.middleware.gzip import GZipMiddleware
 
 # Monkey-patch Gradio to handle Unicode filenames
 # Python 3.13's os.path.realpath() fails on filenames with Unicode chars like '\u202f'
@@ -58,6 +62,7 @@ from portal_client import (
     HailoPoseClient,
     HailoVisionClient,
     HailoWhisperClient,
+    close_session,
 )
 from service_manager import ServiceManager
 
@@ -74,11 +79,27 @@ piper_client = HailoPiperClient()
 
 app = FastAPI()
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"])
+# Compresses the API and the Gradio sub-app mounted below (embedding and
+# batch JSON, page assets). Starlette >= 0.46 (pinned in requirements.txt)
+# leaves text/event-stream alone, so Gradio's event stream is not buffered;
+# every other type over minimum_size is compressed, media included. Level 6
+# keeps most of the ratio at a fraction of level 9's CPU on the Pi.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
+
+# (monitor snapshot, JSON body). The snapshot only changes once per monitor
+# poll, so it is serialized with orjson once rather than on every request.
+_status_body_cache: Tuple[Optional[Dict[str, Any]], bytes] = (None, b"")
 
 
 @app.get("/api/status")
-async def get_device_status() -> Dict[str, Any]:
-    return monitor.get_status()
+async def get_device_status() -> Response:
+    # Non-blocking: returns the snapshot kept fresh by the monitor's poll task
+    global _status_body_cache
+    snapshot = monitor.latest_status
+    if _status_body_cache[0] is not snapshot:
+        _status_body_cache = (snapshot, orjson.dumps(monitor.get_status()))
+    return Response(_status_body_cache[1], media_type="application/json")
 
 
 @app.get("/api/services/status")
@@ -116,6 +137,166 @@ async def disable_service(service_name: str) -> Dict[str, str]:
     return await service_mgr.disable_service(service_name)
 
 
+# (monitor snapshot, formatted header outputs). Every open browser tab polls
+# the same snapshot, so it is formatted once per monitor poll, not per tab.
+_status_outputs_cache: Tuple[Optional[Dict[str, Any]], tuple] = (None, ())
+
+
+def _status_outputs() -> tuple:
+    global _status_outputs_cache
+    snapshot = monitor.latest_status
+    cached_snapshot, outputs = _status_outputs_cache
+    if cached_snapshot is snapshot:
+        return outputs
+
+    status_data = monitor.get_status()
+
+    # Format device info for subtitle
+    device_header = format_device_header(status_data)
+    subtitle_text = (
+        f"Comprehensive testing interface for Hailo-10H AI services on Raspberry Pi 5.  \n"
+        f"**{device_header}**"
+    )
+    capacity_reason = status_data.get("last_capacity_event_reason")
+    if capacity_reason:
+        subtitle_text += f"  \nLast capacity event: {capacity_reason}"
+
+    device = status_data.get("device", {})
+    temp_c = device.get("temperature_celsius", 0)
+    temp_gauge_html = create_temperature_gauge_html(temp_c)
+
+    networks = format_networks_table(status_data)
+
+    queue_depth = status_data.get("queue_depth", 0)
+    queue_gauge_html = create_queue_gauge_html(queue_depth)
+
+    ram_overview_html = create_ram_overview_html(status_data)
+
+    outputs = (
+        subtitle_text,
+        temp_gauge_html,
+        networks,
+        queue_gauge_html,
+        ram_overview_html,
+    )
+    _status_outputs_cache = (snapshot, outputs)
+    return outputs
+
+
+# Concurrent calls Gradio allows per event listener (its default is 1)
+EVENT_CONCURRENCY_LIMIT = 8
+
+# Health / readiness / model-list buttons reuse a result this fresh, and
+# concurrent clicks share one in-flight request
+INFO_TTL_SECONDS = 2.0
+
+# The Piper voice list only changes when voices are installed; the dropdown
+# refresh and the Info tab's Voices button share one cached copy
+VOICE_LIST_TTL_SECONDS = 10.0
+
+
+# Callers currently awaiting each shared task
+_shared_waiters: Dict[asyncio.Future, int] = {}
+
+
+async def _await_shared(task: asyncio.Future) -> Any:
+    """Await a task shared between callers.
+
+    Cancelling one caller (e.g. a Gradio event the user navigated away from)
+    leaves the task running for the others; once the last caller is gone the
+    task is cancelled too, which closes its backend request.
+    """
+    _shared_waiters[task] = _shared_waiters.get(task, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        _shared_waiters[task] -= 1
+        if not _shared_waiters[task]:
+            del _shared_waiters[task]
+            task.cancel()
+
+
+def ttl_async(ttl: float) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Memoize an async function's result per argument tuple for ``ttl`` seconds."""
+
+    def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        cache: Dict[tuple, Tuple[float, asyncio.Future]] = {}
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any) -> Any:
+            now = time.monotonic()
+            entry = cache.get(args)
+            if entry is None or now >= entry[0]:
+                task = asyncio.ensure_future(fn(*args))
+                entry = (now + ttl, task)
+                cache[args] = entry
+
+                def _forget_failure(done: asyncio.Future, key: tuple = args) -> None:
+                    if done.cancelled() or done.exception() is not None:
+                        if cache.get(key, (0.0, None))[1] is done:
+                            del cache[key]
+
+                task.add_done_callback(_forget_failure)
+            return await _await_shared(entry[1])
+
+        return wrapper
+
+    return decorator
+
+
+def single_flight(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Let concurrent calls with the same arguments share one in-flight call.
+
+    Gradio hands uploads over as paths under a content-hashed cache directory,
+    so the same picture submitted twice produces the same arguments.
+    """
+    inflight: Dict[tuple, asyncio.Future] = {}
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any) -> Any:
+        task = inflight.get(args)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args))
+            inflight[args] = task
+            task.add_done_callback(lambda _done, key=args: inflight.pop(key, None))
+        return await _await_shared(task)
+
+    return wrapper
+
+
+# Generated audio and depth images are written to a fixed ring of paths on
+# tmpfs instead of a new file on the SD card per request. Gradio copies
+# returned files into its own cache, so a slot is safe to overwrite once
+# TEMP_POOL_SIZE newer outputs have been produced.
+TEMP_DIR = Path(
+    os.environ.get(
+        "HAILO_PORTAL_TMPDIR",
+        "/dev/shm/hailo_portal" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+    )
+)
+TEMP_POOL_SIZE = 16
+_temp_slots = itertools.count()
+
+
+def _write_temp(data: bytes, suffix: str) -> str:
+    """Write data to the next pooled temp path and return it."""
+    slot = next(_temp_slots) % TEMP_POOL_SIZE
+    path = TEMP_DIR / f"output_{slot}{suffix}"
+    # Replace atomically so a reader never sees a half-written file
+    partial = path.with_name(path.name + ".part")
+    partial.write_bytes(data)
+    os.replace(partial, path)
+    return str(path)
+
+
+def _write_png_b64(png_b64: str) -> str:
+    """Decode a base64 PNG into a pooled temp file and return its path."""
+    return _write_temp(base64.b64decode(png_b64), ".png")
+
+
+# The Blocks graph holds hundreds of components and handler closures; build
+# it once per process and hand the same object to every caller
+@functools.cache
 def build_gradio_interface() -> gr.Blocks:
     with gr.Blocks(
         title="Hailo AI Services Portal",
@@ -157,37 +338,10 @@ def build_gradio_interface() -> gr.Blocks:
                 wrap=True,
             )
 
-        def update_status() -> tuple:
-            status_data = monitor.get_status()
-            
-            # Format device info for subtitle
-            device_header = format_device_header(status_data)
-            subtitle_text = (
-                f"Comprehensive testing interface for Hailo-10H AI services on Raspberry Pi 5.  \n"
-                f"**{device_header}**"
-            )
-            capacity_reason = status_data.get("last_capacity_event_reason")
-            if capacity_reason:
-                subtitle_text += f"  \nLast capacity event: {capacity_reason}"
-            
-            device = status_data.get("device", {})
-            temp_c = device.get("temperature_celsius", 0)
-            temp_gauge_html = create_temperature_gauge_html(temp_c)
-            
-            networks = format_networks_table(status_data)
-            
-            queue_depth = status_data.get("queue_depth", 0)
-            queue_gauge_html = create_queue_gauge_html(queue_depth)
-
-            ram_overview_html = create_ram_overview_html(status_data)
-            
-            return (
-                subtitle_text,
-                temp_gauge_html,
-                networks,
-                queue_gauge_html,
-                ram_overview_html,
-            )
+        # Async so Gradio runs it on the event loop: it only reads the
+        # monitor's in-memory snapshot, which does not merit a worker thread
+        async def update_status() -> tuple:
+            return _status_outputs()
 
         refresh_status_btn.click(
             fn=update_status,
@@ -224,6 +378,7 @@ def build_gradio_interface() -> gr.Blocks:
                                 clip_result = gr.JSON(label="Results")
                                 clip_timing = gr.Textbox(label="Inference Time", interactive=False)
 
+                        @single_flight
                         async def classify_image(
                             image: str, prompts_text: str, top_k: int, threshold: float
                         ) -> Tuple[Dict[str, Any], str]:
@@ -251,6 +406,7 @@ def build_gradio_interface() -> gr.Blocks:
                                     label="First 10 Values", interactive=False
                                 )
 
+                        @single_flight
                         async def get_image_embedding(image: str) -> Tuple[Dict[str, Any], str]:
                             if not image:
                                 return {"error": "Missing image"}, ""
@@ -278,6 +434,7 @@ def build_gradio_interface() -> gr.Blocks:
                             with gr.Column():
                                 clip_text_embed_result = gr.JSON(label="Embedding")
 
+                        @single_flight
                         async def get_text_embedding(text: str) -> Dict[str, Any]:
                             if not text:
                                 return {"error": "Missing text"}
@@ -294,6 +451,7 @@ def build_gradio_interface() -> gr.Blocks:
                             clip_health_btn = gr.Button("Health")
                         clip_health = gr.JSON(label="Health")
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def clip_health_info() -> Dict[str, Any]:
                             return await clip_client.health()
 
@@ -401,6 +559,7 @@ def build_gradio_interface() -> gr.Blocks:
                         vision_health_btn = gr.Button("Health")
                         vision_health = gr.JSON(label="Health")
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def vision_health_info() -> Dict[str, Any]:
                             return await vision_client.health()
 
@@ -456,6 +615,8 @@ def build_gradio_interface() -> gr.Blocks:
                                 return "No audio uploaded", {}
                             lang_code = None if lang == "Auto" else lang
                             result = await whisper_client.transcribe(audio, lang_code, fmt, temp)
+                            if "error" in result:
+                                return f"Error: {result['error']}", result
                             if fmt in {"text", "srt", "vtt"}:
                                 return result.get("text", ""), {}
                             return result.get("text", ""), result
@@ -478,12 +639,15 @@ def build_gradio_interface() -> gr.Blocks:
                             whisper_models_btn = gr.Button("Models")
                         whisper_info = gr.JSON(label="Info")
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def whisper_health_info() -> Dict[str, Any]:
                             return await whisper_client.health()
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def whisper_ready_info() -> Dict[str, Any]:
                             return await whisper_client.readiness()
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def whisper_models_info() -> Dict[str, Any]:
                             return await whisper_client.list_models()
 
@@ -513,6 +677,7 @@ def build_gradio_interface() -> gr.Blocks:
                                     label="Performance", interactive=False
                                 )
 
+                        @single_flight
                         async def extract_text(
                             image: str, lang: str
                         ) -> Tuple[str, Dict[str, Any], str]:
@@ -538,12 +703,15 @@ def build_gradio_interface() -> gr.Blocks:
                             ocr_models_btn = gr.Button("Models")
                         ocr_info = gr.JSON(label="Info")
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def ocr_health_info() -> Dict[str, Any]:
                             return await ocr_client.health()
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def ocr_ready_info() -> Dict[str, Any]:
                             return await ocr_client.readiness()
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def ocr_models_info() -> Dict[str, Any]:
                             return await ocr_client.list_models()
 
@@ -590,6 +758,7 @@ def build_gradio_interface() -> gr.Blocks:
                                     label="People Detected", interactive=False
                                 )
 
+                        @single_flight
                         async def detect_poses(
                             image: str,
                             conf: float,
@@ -625,12 +794,15 @@ def build_gradio_interface() -> gr.Blocks:
                             pose_models_btn = gr.Button("Models")
                         pose_info = gr.JSON(label="Info")
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def pose_health_info() -> Dict[str, Any]:
                             return await pose_client.health()
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def pose_ready_info() -> Dict[str, Any]:
                             return await pose_client.readiness()
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def pose_models_info() -> Dict[str, Any]:
                             return await pose_client.list_models()
 
@@ -668,9 +840,10 @@ def build_gradio_interface() -> gr.Blocks:
                                     label="Inference Time", interactive=False
                                 )
 
+                        @single_flight
                         async def estimate_depth(
                             image: str, fmt: str, colormap: str, normalize: bool
-                        ) -> Tuple[Optional[Image.Image], Dict[str, Any], str]:
+                        ) -> Tuple[Optional[str], Dict[str, Any], str]:
                             if not image:
                                 return None, {"error": "No image"}, ""
                             result = await depth_client.estimate_depth(
@@ -678,9 +851,12 @@ def build_gradio_interface() -> gr.Blocks:
                             )
                             depth_img = None
                             if isinstance(result, dict) and "depth_image" in result:
+                                # Hand Gradio the PNG file as-is; decoding it to a
+                                # PIL image would only be re-encoded for the browser
                                 try:
-                                    img_data = base64.b64decode(result["depth_image"])
-                                    depth_img = Image.open(io.BytesIO(img_data))
+                                    depth_img = await asyncio.to_thread(
+                                        _write_png_b64, result["depth_image"]
+                                    )
                                 except Exception:
                                     depth_img = None
                             timing = f"{result.get('inference_time_ms', 0):.1f} ms"
@@ -699,12 +875,15 @@ def build_gradio_interface() -> gr.Blocks:
                             depth_info_btn = gr.Button("Info")
                         depth_info = gr.JSON(label="Info")
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def depth_health_info() -> Dict[str, Any]:
                             return await depth_client.health()
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def depth_ready_info() -> Dict[str, Any]:
                             return await depth_client.readiness()
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def depth_service_info() -> Dict[str, Any]:
                             return await depth_client.info()
 
@@ -743,8 +922,12 @@ def build_gradio_interface() -> gr.Blocks:
                                     label="Status", interactive=False
                                 )
 
+                        @ttl_async(VOICE_LIST_TTL_SECONDS)
+                        async def piper_voices() -> Dict[str, Any]:
+                            return await piper_client.list_voices()
+
                         async def refresh_voices() -> gr.Dropdown:
-                            result = await piper_client.list_voices()
+                            result = await piper_voices()
                             voices = [v.get("id") for v in result.get("voices", [])]
                             if not voices:
                                 voices = ["default"]
@@ -758,10 +941,10 @@ def build_gradio_interface() -> gr.Blocks:
                             audio_bytes = await piper_client.synthesize_openai(
                                 text, voice=voice, response_format=fmt, speed=speed
                             )
+                            if isinstance(audio_bytes, dict):
+                                return None, None, f"Error: {audio_bytes['error']}"
                             suffix = ".wav" if fmt == "wav" else ".pcm"
-                            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                                tmp.write(audio_bytes)
-                                path = tmp.name
+                            path = await asyncio.to_thread(_write_temp, audio_bytes, suffix)
                             preview = path if fmt == "wav" else None
                             return preview, path, f"Synthesized {len(text)} characters"
 
@@ -793,9 +976,9 @@ def build_gradio_interface() -> gr.Blocks:
                             if not text:
                                 return None, None, "No text provided"
                             audio_bytes = await piper_client.synthesize_simple(text, fmt)
-                            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-                                tmp.write(audio_bytes)
-                                path = tmp.name
+                            if isinstance(audio_bytes, dict):
+                                return None, None, f"Error: {audio_bytes['error']}"
+                            path = await asyncio.to_thread(_write_temp, audio_bytes, ".wav")
                             return path, path, "Synthesis complete"
 
                         simple_btn.click(
@@ -810,14 +993,12 @@ def build_gradio_interface() -> gr.Blocks:
                             piper_voices_btn = gr.Button("Voices")
                         piper_info = gr.JSON(label="Info")
 
+                        @ttl_async(INFO_TTL_SECONDS)
                         async def piper_health_info() -> Dict[str, Any]:
                             return await piper_client.health()
 
-                        async def piper_voices_info() -> Dict[str, Any]:
-                            return await piper_client.list_voices()
-
                         piper_health_btn.click(fn=piper_health_info, outputs=[piper_info])
-                        piper_voices_btn.click(fn=piper_voices_info, outputs=[piper_info])
+                        piper_voices_btn.click(fn=piper_voices, outputs=[piper_info])
 
             with gr.TabItem("Service Control"):
                 gr.Markdown("### System Service Management")
@@ -935,19 +1116,29 @@ def build_gradio_interface() -> gr.Blocks:
                     summary = " | ".join(messages) if messages else "No changes applied."
                     return refreshed_rows, summary, refreshed_rows
 
+                # systemctl calls for different units are independent, so fan
+                # them out; one failing unit must not hold up the rest
                 async def start_all() -> Tuple[List[List[Any]], str, List[List[Any]]]:
-                    for service in service_mgr.SERVICE_NAMES:
-                        if service in {"hailo-ollama", "hailo-device-manager"}:
-                            continue
-                        await service_mgr.start_service(service)
+                    await asyncio.gather(
+                        *(
+                            service_mgr.start_service(service)
+                            for service in service_mgr.SERVICE_NAMES
+                            if service not in {"hailo-ollama", "hailo-device-manager"}
+                        ),
+                        return_exceptions=True,
+                    )
                     rows = await refresh_services()
                     return rows, "Start requested for all services (excluding ollama).", rows
 
                 async def stop_all() -> Tuple[List[List[Any]], str, List[List[Any]]]:
-                    for service in service_mgr.SERVICE_NAMES:
-                        if service == "hailo-device-manager":
-                            continue
-                        await service_mgr.stop_service(service)
+                    await asyncio.gather(
+                        *(
+                            service_mgr.stop_service(service)
+                            for service in service_mgr.SERVICE_NAMES
+                            if service != "hailo-device-manager"
+                        ),
+                        return_exceptions=True,
+                    )
                     rows = await refresh_services()
                     return rows, "Stop requested for all services.", rows
 
@@ -973,11 +1164,17 @@ def build_gradio_interface() -> gr.Blocks:
                     outputs=[services_status, service_table_state],
                 )
 
+    # Gradio runs each event one call at a time by default, so users queued
+    # behind each other even though the handlers are async and the services
+    # gate device access themselves. Letting calls overlap also lets
+    # single_flight merge identical ones.
+    demo.queue(default_concurrency_limit=EVENT_CONCURRENCY_LIMIT)
     return demo
 
 
+TEMP_DIR.mkdir(parents=True, exist_ok=True)
 gradio_demo = build_gradio_interface()
-app = gr.mount_gradio_app(app, gradio_demo, path="/")
+app = gr.mount_gradio_app(app, gradio_demo, path="/", allowed_paths=[str(TEMP_DIR)])
 
 
 @app.on_event("startup")
@@ -988,9 +1185,13 @@ async def startup_event() -> None:
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
     await monitor.stop()
+    await close_session()
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=7860)
+    # uvicorn[standard] brings uvloop and httptools, which the "auto" loop and
+    # http settings pick up. Stay on one worker: Gradio keeps session and queue
+    # state in process, and the unit's MemoryMax has no room for a second copy.
+    uvicorn.run(app, host="0.0.0.0", port=7860, workers=1)
@@ -1,27 +1,106 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import contextlib
+import hashlib
 import mimetypes
+import struct
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import aiohttp
 
-DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=120)
+# Inference can take a while, but a loopback connect that stalls means the
+# service is wedged, so fail that fast
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=120, connect=5)
 
+# Idempotent GETs are retried when a pooled keep-alive connection turns out
+# to have been closed by the service (e.g. after a restart)
+GET_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 0.1
+
+# One keep-alive session shared by every service client, so portal requests
+# reuse pooled connections instead of opening a new one each time
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Return the shared session, creating it on first use (needs a running loop)."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, limit_per_host=32, keepalive_timeout=30),
+            timeout=DEFAULT_TIMEOUT,
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared session; call on application shutdown."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+# Data URIs of recently uploaded images, keyed by content digest, so trying
+# the same picture on several tabs base64-encodes it only once. Bounded by
+# total size rather than entry count: a phone photo alone is a 10+ MB data
+# URI, and the portal runs under a 200 MB MemoryMax
+DATA_URI_CACHE_BYTES = 8 * 1024 * 1024
+# Larger uploads are encoded on every use and never cached
+DATA_URI_CACHE_MAX_UPLOAD = 2 * 1024 * 1024
+_data_uris: "OrderedDict[Tuple[bytes, str], str]" = OrderedDict()
+_data_uri_bytes = 0
+
+
+def _read_upload(path: str, default_mime: str) -> Tuple[bytes, str]:
+    return Path(path).read_bytes(), _guess_mime(path, default_mime)
+
+
+def _read_image_upload(path: str, default_mime: str) -> Tuple[bytes, str, Optional[bytes]]:
+    """Read an upload and digest it if it is small enough to cache."""
+    data, mime = _read_upload(path, default_mime)
+    if len(data) > DATA_URI_CACHE_MAX_UPLOAD:
+        return data, mime, None
+    return data, mime, hashlib.blake2b(data, digest_size=16).digest()
+
+
+async def _prepare_image(path: str, default_mime: str = "image/jpeg") -> Tuple[bytes, str]:
+    """Read an uploaded file in a worker thread; returns (bytes, content_type)."""
+    return await asyncio.to_thread(_read_upload, path, default_mime)
+
+
+def _to_data_uri(data: bytes, mime: str) -> str:
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
 
-def _encode_file_to_data_uri(path: str, default_mime: str = "image/jpeg") -> str:
-    mime, _ = mimetypes.guess_type(path)
-    if not mime:
-        mime = default_mime
-    data = Path(path).read_bytes()
-    b64 = base64.b64encode(data).decode("ascii")
-    return f"data:{mime};base64,{b64}"
 
+def _cache_data_uri(key: Tuple[bytes, str], uri: str) -> None:
+    global _data_uri_bytes
+    if key in _data_uris:
+        return
+    _data_uris[key] = uri
+    _data_uri_bytes += len(uri)
+    while _data_uri_bytes > DATA_URI_CACHE_BYTES:
+        _, evicted = _data_uris.popitem(last=False)
+        _data_uri_bytes -= len(evicted)
 
-def _encode_file_base64(path: str) -> str:
-    data = Path(path).read_bytes()
-    return base64.b64encode(data).decode("ascii")
+
+async def _image_data_uri(path: str, default_mime: str = "image/jpeg") -> str:
+    """Return the file as a data URI, reusing the encoding for repeated content."""
+    data, mime, digest = await asyncio.to_thread(_read_image_upload, path, default_mime)
+    if digest is None:
+        return await asyncio.to_thread(_to_data_uri, data, mime)
+    key = (digest, mime)
+    uri = _data_uris.get(key)
+    if uri is not None:
+        _data_uris.move_to_end(key)
+        return uri
+    uri = await asyncio.to_thread(_to_data_uri, data, mime)
+    _cache_data_uri(key, uri)
+    return uri
 
 
 def _guess_mime(path: str, default_mime: str) -> str:
@@ -67,6 +146,31 @@ def _safe_filename(path: str) -> str:
     return safe_name
 
 
+@contextlib.asynccontextmanager
+async def _send(
+    method: str,
+    url: str,
+    json_body: Optional[Dict[str, Any]],
+    data: Optional[aiohttp.FormData],
+    timeout: aiohttp.ClientTimeout,
+    headers: Optional[Dict[str, str]] = None,
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    session = _get_session()
+    attempts = GET_RETRIES + 1 if method == "GET" else 1
+    for attempt in range(attempts):
+        try:
+            resp = await session.request(
+                method, url, json=json_body, data=data, timeout=timeout, headers=headers
+            )
+            break
+        except aiohttp.ServerDisconnectedError:
+            if attempt + 1 == attempts:
+                raise
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2**attempt)
+    async with resp:
+        yield resp
+
+
 async def _request_json(
     method: str,
     url: str,
@@ -74,17 +178,71 @@ async def _request_json(
     data: Optional[aiohttp.FormData] = None,
     timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
 ) -> Dict[str, Any]:
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.request(method, url, json=json_body, data=data) as resp:
-            content_type = resp.headers.get("Content-Type", "")
-            if "application/json" in content_type:
-                payload: Dict[str, Any] = await resp.json()
-            else:
-                payload = {"text": await resp.text()}
+    try:
+        async with _send(method, url, json_body, data, timeout) as resp:
+            return await _read_json_payload(resp)
+    except asyncio.TimeoutError as exc:
+        return _deadline_error(timeout, exc)
+
+
+def _deadline_error(
+    timeout: aiohttp.ClientTimeout, exc: asyncio.TimeoutError
+) -> Dict[str, Any]:
+    # aiohttp raises ServerTimeoutError("Connection timeout to host ...") for
+    # the connect limit (ConnectionTimeoutError on newer releases); the total
+    # deadline surfaces as a plain asyncio.TimeoutError.
+    connect_error = getattr(aiohttp, "ConnectionTimeoutError", ())
+    if isinstance(exc, connect_error) or (
+        isinstance(exc, aiohttp.ServerTimeoutError)
+        and str(exc).startswith("Connection timeout")
+    ):
+        return {"error": f"Connect timeout of {timeout.connect:g} s exceeded", "status": 504}
+    return {"error": f"Deadline of {timeout.total:g} s exceeded", "status": 504}
 
-            if resp.status >= 400:
-                return {"error": payload, "status": resp.status}
-            return payload
+
+async def _read_json_payload(resp: aiohttp.ClientResponse) -> Dict[str, Any]:
+    content_type = resp.headers.get("Content-Type", "")
+    if "application/json" in content_type:
+        payload: Dict[str, Any] = await resp.json()
+    else:
+        payload = {"text": await resp.text()}
+
+    if resp.status >= 400:
+        return {"error": payload, "status": resp.status}
+    return payload
+
+
+# Services that support it answer this with raw little-endian float16
+# embeddings (2 bytes per value) instead of a JSON list of floats
+_BINARY_EMBEDDING_ACCEPT = {"Accept": "application/octet-stream, application/json;q=0.5"}
+
+
+async def _request_embedding(
+    url: str,
+    json_body: Dict[str, Any],
+    timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
+) -> Dict[str, Any]:
+    """POST for an embedding, decoding the binary float16 form when returned."""
+    try:
+        async with _send("POST", url, json_body, None, timeout, _BINARY_EMBEDDING_ACCEPT) as resp:
+            if resp.status >= 400 or resp.content_type != "application/octet-stream":
+                return await _read_json_payload(resp)
+            data = await resp.read()
+            dimension = len(data) // 2
+            declared = resp.headers.get("X-Embedding-Dimension")
+            if len(data) % 2 or (declared is not None and declared != str(dimension)):
+                return {
+                    "error": f"Malformed float16 embedding: {len(data)} bytes, "
+                    f"X-Embedding-Dimension {declared}",
+                    "status": 502,
+                }
+            return {
+                "embedding": list(struct.unpack(f"<{dimension}e", data)),
+                "dimension": dimension,
+                "model": resp.headers.get("X-Embedding-Model"),
+            }
+    except asyncio.TimeoutError as exc:
+        return _deadline_error(timeout, exc)
 
 
 async def _request_bytes(
@@ -93,57 +251,109 @@ async def _request_bytes(
     json_body: Optional[Dict[str, Any]] = None,
     data: Optional[aiohttp.FormData] = None,
     timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
-) -> bytes:
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.request(method, url, json=json_body, data=data) as resp:
+) -> Union[bytes, Dict[str, Any]]:
+    """Return the raw response body, or the 504 error dict past the deadline."""
+    try:
+        async with _send(method, url, json_body, data, timeout) as resp:
             return await resp.read()
+    except asyncio.TimeoutError as exc:
+        return _deadline_error(timeout, exc)
 
 
 async def _request_text(
     method: str,
     url: str,
+    key: str,
     json_body: Optional[Dict[str, Any]] = None,
     data: Optional[aiohttp.FormData] = None,
     timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
-) -> str:
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.request(method, url, json=json_body, data=data) as resp:
-            return await resp.text()
+) -> Dict[str, Any]:
+    """Return {key: response text}, or the 504 error dict past the deadline."""
+    try:
+        async with _send(method, url, json_body, data, timeout) as resp:
+            return {key: await resp.text()}
+    except asyncio.TimeoutError as exc:
+        return _deadline_error(timeout, exc)
 
 
-class HailoClipClient:
-    def __init__(self, base_url: str = "http://127.0.0.1:5000") -> None:
+class _ServiceClient:
+    # Per-call deadline for the service. A call past it, or one whose Gradio
+    # event is cancelled, closes its connection rather than waiting on (and
+    # then discarding) a result nobody will see.
+    deadline_seconds: float = 30.0
+
+    def __init__(self, base_url: str) -> None:
         self.base_url = base_url
+        self.timeout = aiohttp.ClientTimeout(
+            total=self.deadline_seconds, connect=DEFAULT_TIMEOUT.connect
+        )
+
+    async def _json(
+        self,
+        method: str,
+        path: str,
+        json_body: Optional[Dict[str, Any]] = None,
+        data: Optional[aiohttp.FormData] = None,
+    ) -> Dict[str, Any]:
+        return await _request_json(method, f"{self.base_url}{path}", json_body, data, self.timeout)
+
+    async def _bytes(
+        self,
+        method: str,
+        path: str,
+        json_body: Optional[Dict[str, Any]] = None,
+        data: Optional[aiohttp.FormData] = None,
+    ) -> Union[bytes, Dict[str, Any]]:
+        return await _request_bytes(method, f"{self.base_url}{path}", json_body, data, self.timeout)
+
+    async def _text(
+        self,
+        method: str,
+        path: str,
+        key: str,
+        json_body: Optional[Dict[str, Any]] = None,
+        data: Optional[aiohttp.FormData] = None,
+    ) -> Dict[str, Any]:
+        return await _request_text(
+            method, f"{self.base_url}{path}", key, json_body, data, self.timeout
+        )
+
+
+class HailoClipClient(_ServiceClient):
+    def __init__(self, base_url: str = "http://127.0.0.1:5000") -> None:
+        super().__init__(base_url)
 
     async def health(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/health")
+        return await self._json("GET", "/health")
 
     async def classify(
         self, image_path: str, prompts: List[str], top_k: int = 3, threshold: float = 0.0
     ) -> Dict[str, Any]:
         payload = {
-            "image": _encode_file_to_data_uri(image_path),
+            "image": await _image_data_uri(image_path),
             "prompts": prompts,
             "top_k": top_k,
             "threshold": threshold,
         }
-        return await _request_json("POST", f"{self.base_url}/v1/classify", json_body=payload)
+        return await self._json("POST", "/v1/classify", json_body=payload)
 
     async def embed_image(self, image_path: str) -> Dict[str, Any]:
-        payload = {"image": _encode_file_to_data_uri(image_path)}
-        return await _request_json("POST", f"{self.base_url}/v1/embed/image", json_body=payload)
+        payload = {"image": await _image_data_uri(image_path)}
+        return await _request_embedding(f"{self.base_url}/v1/embed/image", payload, self.timeout)
 
     async def embed_text(self, text: str) -> Dict[str, Any]:
         payload = {"text": text}
-        return await _request_json("POST", f"{self.base_url}/v1/embed/text", json_body=payload)
+        return await _request_embedding(f"{self.base_url}/v1/embed/text", payload, self.timeout)
 
 
-class HailoVisionClient:
+class HailoVisionClient(_ServiceClient):
+    deadline_seconds = 120.0
+
     def __init__(self, base_url: str = "http://127.0.0.1:11435") -> None:
-        self.base_url = base_url
+        super().__init__(base_url)
 
     async def health(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/health")
+        return await self._json("GET", "/health")
 
     async def chat_completions(
         self,
@@ -160,7 +370,7 @@ class HailoVisionClient:
                 {
                     "role": "user",
                     "content": [
-                        {"type": "image_url", "image_url": {"url": _encode_file_to_data_uri(image_path)}},
+                        {"type": "image_url", "image_url": {"url": await _image_data_uri(image_path)}},
                         {"type": "text", "text": prompt},
                     ],
                 }
@@ -171,11 +381,8 @@ class HailoVisionClient:
             "stream": stream,
         }
         if stream:
-            text = await _request_text(
-                "POST", f"{self.base_url}/v1/chat/completions", json_body=payload
-            )
-            return {"stream": text}
-        return await _request_json("POST", f"{self.base_url}/v1/chat/completions", json_body=payload)
+            return await self._text("POST", "/v1/chat/completions", "stream", json_body=payload)
+        return await self._json("POST", "/v1/chat/completions", json_body=payload)
 
     async def vision_analyze(
         self,
@@ -185,7 +392,8 @@ class HailoVisionClient:
         max_tokens: int = 150,
         return_individual_results: bool = False,
     ) -> Dict[str, Any]:
-        images = [_encode_file_to_data_uri(path) for path in image_paths]
+        # Read and encode the files in worker threads, not on the event loop
+        images = await asyncio.gather(*(_image_data_uri(path) for path in image_paths))
         payload = {
             "images": images,
             "prompt": prompt,
@@ -193,21 +401,23 @@ class HailoVisionClient:
             "max_tokens": max_tokens,
             "return_individual_results": return_individual_results,
         }
-        return await _request_json("POST", f"{self.base_url}/v1/vision/analyze", json_body=payload)
+        return await self._json("POST", "/v1/vision/analyze", json_body=payload)
+
 
+class HailoWhisperClient(_ServiceClient):
+    deadline_seconds = 120.0
 
-class HailoWhisperClient:
     def __init__(self, base_url: str = "http://127.0.0.1:11437") -> None:
-        self.base_url = base_url
+        super().__init__(base_url)
 
     async def health(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/health")
+        return await self._json("GET", "/health")
 
     async def readiness(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/health/ready")
+        return await self._json("GET", "/health/ready")
 
     async def list_models(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/v1/models")
+        return await self._json("GET", "/v1/models")
 
     async def transcribe(
         self,
@@ -217,12 +427,12 @@ class HailoWhisperClient:
         temperature: float = 0.0,
     ) -> Dict[str, Any]:
         form_data = aiohttp.FormData()
-        audio_bytes = Path(audio_path).read_bytes()
+        audio_bytes, content_type = await asyncio.to_thread(_read_upload, audio_path, "audio/mpeg")
         form_data.add_field(
             "file",
             audio_bytes,
             filename=_safe_filename(audio_path),
-            content_type=_guess_mime(audio_path, "audio/mpeg"),
+            content_type=content_type,
         )
         form_data.add_field("model", "Whisper-Base")
         if language:
@@ -231,45 +441,40 @@ class HailoWhisperClient:
         form_data.add_field("temperature", str(temperature))
 
         if response_format in {"text", "srt", "vtt"}:
-            text = await _request_text(
-                "POST", f"{self.base_url}/v1/audio/transcriptions", data=form_data
-            )
-            return {"text": text}
-        return await _request_json(
-            "POST", f"{self.base_url}/v1/audio/transcriptions", data=form_data
-        )
+            return await self._text("POST", "/v1/audio/transcriptions", "text", data=form_data)
+        return await self._json("POST", "/v1/audio/transcriptions", data=form_data)
 
 
-class HailoOCRClient:
+class HailoOCRClient(_ServiceClient):
     def __init__(self, base_url: str = "http://127.0.0.1:11436") -> None:
-        self.base_url = base_url
+        super().__init__(base_url)
 
     async def health(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/health")
+        return await self._json("GET", "/health")
 
     async def readiness(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/health/ready")
+        return await self._json("GET", "/health/ready")
 
     async def list_models(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/models")
+        return await self._json("GET", "/models")
 
     async def extract_text(self, image_path: str, languages: List[str]) -> Dict[str, Any]:
-        payload = {"image": _encode_file_to_data_uri(image_path), "languages": languages}
-        return await _request_json("POST", f"{self.base_url}/v1/ocr/extract", json_body=payload)
+        payload = {"image": await _image_data_uri(image_path), "languages": languages}
+        return await self._json("POST", "/v1/ocr/extract", json_body=payload)
 
 
-class HailoPoseClient:
+class HailoPoseClient(_ServiceClient):
     def __init__(self, base_url: str = "http://127.0.0.1:11440") -> None:
-        self.base_url = base_url
+        super().__init__(base_url)
 
     async def health(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/health")
+        return await self._json("GET", "/health")
 
     async def readiness(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/health/ready")
+        return await self._json("GET", "/health/ready")
 
     async def list_models(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/v1/models")
+        return await self._json("GET", "/v1/models")
 
     async def detect_poses(
         self,
@@ -280,32 +485,32 @@ class HailoPoseClient:
         keypoint_threshold: float = 0.3,
     ) -> Dict[str, Any]:
         form_data = aiohttp.FormData()
-        image_bytes = Path(image_path).read_bytes()
+        image_bytes, content_type = await _prepare_image(image_path)
         form_data.add_field(
             "image",
             image_bytes,
             filename=_safe_filename(image_path),
-            content_type=_guess_mime(image_path, "image/jpeg"),
+            content_type=content_type,
         )
         form_data.add_field("confidence_threshold", str(confidence_threshold))
         form_data.add_field("iou_threshold", str(iou_threshold))
         form_data.add_field("max_detections", str(max_detections))
         form_data.add_field("keypoint_threshold", str(keypoint_threshold))
-        return await _request_json("POST", f"{self.base_url}/v1/pose/detect", data=form_data)
+        return await self._json("POST", "/v1/pose/detect", data=form_data)
 
 
-class HailoDepthClient:
+class HailoDepthClient(_ServiceClient):
     def __init__(self, base_url: str = "http://127.0.0.1:11439") -> None:
-        self.base_url = base_url
+        super().__init__(base_url)
 
     async def health(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/health")
+        return await self._json("GET", "/health")
 
     async def readiness(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/health/ready")
+        return await self._json("GET", "/health/ready")
 
     async def info(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/v1/info")
+        return await self._json("GET", "/v1/info")
 
     async def estimate_depth(
         self,
@@ -315,44 +520,45 @@ class HailoDepthClient:
         colormap: str = "viridis",
     ) -> Dict[str, Any]:
         form_data = aiohttp.FormData()
-        image_bytes = Path(image_path).read_bytes()
+        image_bytes, content_type = await _prepare_image(image_path)
         form_data.add_field(
             "image",
             image_bytes,
             filename=_safe_filename(image_path),
-            content_type=_guess_mime(image_path, "image/jpeg"),
+            content_type=content_type,
         )
         form_data.add_field("output_format", output_format)
         form_data.add_field("normalize", str(normalize).lower())
         form_data.add_field("colormap", colormap)
-        return await _request_json("POST", f"{self.base_url}/v1/depth/estimate", data=form_data)
+        return await self._json("POST", "/v1/depth/estimate", data=form_data)
 
 
-class HailoOllamaClient:
+class HailoOllamaClient(_ServiceClient):
+    deadline_seconds = 300.0
+
     def __init__(self, base_url: str = "http://127.0.0.1:11434") -> None:
-        self.base_url = base_url
+        super().__init__(base_url)
 
     async def version(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/api/version")
+        return await self._json("GET", "/api/version")
 
     async def tags(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/api/tags")
+        return await self._json("GET", "/api/tags")
 
     async def list_simple(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/hailo/v1/list")
+        return await self._json("GET", "/hailo/v1/list")
 
     async def ps(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/api/ps")
+        return await self._json("GET", "/api/ps")
 
     async def show(self, model: str) -> Dict[str, Any]:
-        return await _request_json("POST", f"{self.base_url}/api/show", json_body={"model": model})
+        return await self._json("POST", "/api/show", json_body={"model": model})
 
     async def pull(self, model: str, stream: bool = True) -> Dict[str, Any]:
         payload = {"model": model, "stream": stream}
         if stream:
-            text = await _request_text("POST", f"{self.base_url}/api/pull", json_body=payload)
-            return {"stream": text}
-        return await _request_json("POST", f"{self.base_url}/api/pull", json_body=payload)
+            return await self._text("POST", "/api/pull", "stream", json_body=payload)
+        return await self._json("POST", "/api/pull", json_body=payload)
 
     async def chat(
         self,
@@ -371,9 +577,8 @@ class HailoOllamaClient:
         if options:
             payload["options"] = options
         if stream:
-            text = await _request_text("POST", f"{self.base_url}/api/chat", json_body=payload)
-            return {"stream": text}
-        return await _request_json("POST", f"{self.base_url}/api/chat", json_body=payload)
+            return await self._text("POST", "/api/chat", "stream", json_body=payload)
+        return await self._json("POST", "/api/chat", json_body=payload)
 
     async def generate(
         self,
@@ -407,12 +612,11 @@ class HailoOllamaClient:
         if options:
             payload["options"] = options
         if stream:
-            text = await _request_text("POST", f"{self.base_url}/api/generate", json_body=payload)
-            return {"stream": text}
-        return await _request_json("POST", f"{self.base_url}/api/generate", json_body=payload)
+            return await self._text("POST", "/api/generate", "stream", json_body=payload)
+        return await self._json("POST", "/api/generate", json_body=payload)
 
     async def delete(self, model: str) -> Dict[str, Any]:
-        return await _request_json("DELETE", f"{self.base_url}/api/delete", json_body={"model": model})
+        return await self._json("DELETE", "/api/delete", json_body={"model": model})
 
     async def openai_chat_completions(
         self,
@@ -445,24 +649,21 @@ class HailoOllamaClient:
         if max_tokens is not None:
             payload["max_tokens"] = max_tokens
         if stream:
-            text = await _request_text(
-                "POST", f"{self.base_url}/v1/chat/completions", json_body=payload
-            )
-            return {"stream": text}
-        return await _request_json(
-            "POST", f"{self.base_url}/v1/chat/completions", json_body=payload
-        )
+            return await self._text("POST", "/v1/chat/completions", "stream", json_body=payload)
+        return await self._json("POST", "/v1/chat/completions", json_body=payload)
 
 
-class HailoPiperClient:
+class HailoPiperClient(_ServiceClient):
+    deadline_seconds = 60.0
+
     def __init__(self, base_url: str = "http://127.0.0.1:5003") -> None:
-        self.base_url = base_url
+        super().__init__(base_url)
 
     async def health(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/health")
+        return await self._json("GET", "/health")
 
     async def list_voices(self) -> Dict[str, Any]:
-        return await _request_json("GET", f"{self.base_url}/v1/voices")
+        return await self._json("GET", "/v1/voices")
 
     async def synthesize_openai(
         self,
@@ -470,7 +671,7 @@ class HailoPiperClient:
         voice: str = "default",
         response_format: str = "wav",
         speed: float = 1.0,
-    ) -> bytes:
+    ) -> Union[bytes, Dict[str, Any]]:
         payload = {
             "input": text,
             "model": "piper",
@@ -478,8 +679,8 @@ class HailoPiperClient:
             "response_format": response_format,
             "speed": speed,
         }
-        return await _request_bytes("POST", f"{self.base_url}/v1/audio/speech", json_body=payload)
+        return await self._bytes("POST", "/v1/audio/speech", json_body=payload)
 
-    async def synthesize_simple(self, text: str, fmt: str = "wav") -> bytes:
+    async def synthesize_simple(self, text: str, fmt: str = "wav") -> Union[bytes, Dict[str, Any]]:
         payload = {"text": text, "format": fmt}
-        return await _request_bytes("POST", f"{self.base_url}/v1/synthesize", json_body=payload)
+        return await self._bytes("POST", "/v1/synthesize", json_body=payload)
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-import subprocess
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 
 class ServiceManager:
@@ -64,46 +63,44 @@ class ServiceManager:
     async def disable_service(self, service_name: str) -> Dict[str, str]:
         return await self._run_systemctl(["disable", service_name])
 
-    async def _is_active(self, service_name: str) -> List[str]:
-        result = await asyncio.to_thread(
-            subprocess.run,
-            ["systemctl", "is-active", service_name],
-            capture_output=True,
-            text=True,
+    @staticmethod
+    async def _exec(*args: str) -> Tuple[int, str, str]:
+        """Run a command without tying up a worker thread while it waits."""
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
-        if result.returncode == 0:
+        stdout, stderr = await proc.communicate()
+        return proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+    async def _is_active(self, service_name: str) -> List[str]:
+        returncode, stdout, _ = await self._exec("systemctl", "is-active", service_name)
+        if returncode == 0:
             return [service_name, "running"]
-        if result.stdout.strip() == "inactive":
+        if stdout.strip() == "inactive":
             return [service_name, "stopped"]
         return [service_name, "error"]
 
     async def _is_enabled(self, service_name: str) -> List[str]:
-        result = await asyncio.to_thread(
-            subprocess.run,
-            ["systemctl", "is-enabled", service_name],
-            capture_output=True,
-            text=True,
-        )
-        status = result.stdout.strip() or result.stderr.strip()
-        if result.returncode == 0:
+        returncode, stdout, stderr = await self._exec("systemctl", "is-enabled", service_name)
+        status = stdout.strip() or stderr.strip()
+        if returncode == 0:
             return [service_name, "enabled"]
         if status in {"disabled", "static", "indirect", "masked", "generated"}:
             return [service_name, status]
         return [service_name, "unknown"]
 
     async def _run_systemctl(self, args: List[str]) -> Dict[str, str]:
-        try:
-            await asyncio.to_thread(
-                subprocess.run,
-                ["sudo", "systemctl", *args],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+        returncode, stdout, stderr = await self._exec("sudo", "systemctl", *args)
+        if returncode == 0:
             return {"status": "ok"}
-        except subprocess.CalledProcessError as exc:
-            message = exc.stderr.strip() or exc.stdout.strip() or str(exc)
-            return {"status": "error", "message": message}
+        message = (
+            stderr.strip()
+            or stdout.strip()
+            or f"systemctl {' '.join(args)} exited with status {returncode}"
+        )
+        return {"status": "error", "message": message}
 
     async def _check_ollama_conflicts(self) -> List[str]:
         status = await self.get_status()